@@ -1,4 +1,5 @@
 import os
+import sys
 
 import bpy
 
@@ -30,6 +31,10 @@ def get_package_name():
     return os.path.basename(get_root_path())
 
 
+def get_addon_version():
+    return sys.modules[get_package_name()].bl_info["version"]
+
+
 def version_override_options():
     return [
         ("DEFAULT", "Default", "Use the version specin the Custom Properties of the exported data"),
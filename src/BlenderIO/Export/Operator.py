@@ -202,7 +202,7 @@ class ExportGFS(bpy.types.Operator, ExportHelper):
         
         gfs.version = self.policies.get_version(selected_model.data.GFSTOOLS_ModelProperties.int_version)
         gfs.has_end_container = True # Put this somewhere else
-        gb = gfs.to_binary()
+        gb = gfs.to_binary(calc_sizes=False)
         model_bin = gb.get_model_block()
         if model_bin is not None:
             if model_bin.data.skinning_data.bone_count is not None:
@@ -384,7 +384,7 @@ class ExportGAP(bpy.types.Operator, ExportHelper):
         
         gfs.version           = self.policies.get_version(active_pack.int_version)
         gfs.has_end_container = False # Put this somewhere else
-        gb = gfs.to_binary(anim_model_binary=gfs_bbox.to_binary(active_pack.int_version).get_model_block().data)
+        gb = gfs.to_binary(anim_model_binary=gfs_bbox.to_binary(active_pack.int_version).get_model_block().data, calc_sizes=False)
         gb.write(filepath)
         
         # Tell the user if there are any warnings they should be aware of.
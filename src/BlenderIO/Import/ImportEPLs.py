@@ -71,7 +71,7 @@ def import_epl(name, epl, errorlog, import_policies):
                 model_data = file.payload
                 
                 gb = GFSBinary()
-                gb.unpack(model_data)
+                gb.unpack(model_data, use_mmap=True)
                 gi = GFSInterface.from_binary(gb, duplicate_data=False)
                 
                 subobject = ImportGFS.import_gfs_object(gi, model_data, lb.name.string, errorlog, import_policies)
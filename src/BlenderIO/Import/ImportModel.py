@@ -115,7 +115,7 @@ def build_bones_from_rest_pose(gfs, main_armature, bones_to_ignore, raw_gfs):
         
     # Now let's replace the mesh vertex data with transformed data
     gb = GFSBinary()
-    gb.unpack(raw_gfs)
+    gb.unpack(raw_gfs, use_mmap=True, lazy=True)
     model_binary = gb.get_model_block().data
     
     bones,   \
@@ -8,6 +8,7 @@ from ...FileFormats.GFS.Interface import EPLFileInterface
 from ..Data import bone_pose_enum_options
 from ..Data import anim_boundbox_policy_options
 from ..Preferences import get_preferences
+from ..Preferences import get_parse_cache
 from ..modelUtilsTest.API.Operator import get_op_idname
 from ..Globals import ErrorLogger
 from .ImportGFS import import_gfs_object
@@ -132,7 +133,7 @@ class ImportGFS(bpy.types.Operator, ImportHelper):
         try:
             with open(filepath, 'rb') as F:
                 raw_gfs = F.read()
-            gfs = GFSInterface.from_bytes(raw_gfs, warnings=warnings)
+            gfs = GFSInterface.from_bytes(raw_gfs, warnings=warnings, use_mmap=True, zero_copy=True, cache=get_parse_cache())
         except NotAGFSFileError as e:
             errorlog.log_error_message(str(e))
         except UnsupportedVersionError as e:
@@ -247,7 +248,7 @@ class ImportGAP(bpy.types.Operator, ImportHelper):
         
         warnings = []
         try:
-            gfs = GFSInterface.from_file(filepath, warnings=warnings)
+            gfs = GFSInterface.from_file(filepath, warnings=warnings, use_mmap=True, zero_copy=True, cache=get_parse_cache())
         except NotAGFSFileError as e:
             errorlog.log_error_message(str(e))
         except UnsupportedVersionError as e:
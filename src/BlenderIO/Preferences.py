@@ -2,7 +2,9 @@ import os
 
 import bpy
 
+from ..FileFormats.GFS.ParseCache import ParseCache
 from .Data import get_package_name
+from .Data import get_addon_version
 from .Data import bone_pose_enum_options
 from .Data import anim_boundbox_policy_options
 from .Data import too_many_vertices_policy_options
@@ -18,6 +20,19 @@ def get_preferences():
     return bpy.context.preferences.addons[get_package_name()].preferences
 
 
+def get_parse_cache():
+    prefs = get_preferences()
+    directory = bpy.path.abspath(prefs.parse_cache_directory)
+    if directory == "":
+        # Keep the cache in the user's own Blender config directory rather
+        # than a location that other users can write to
+        directory = bpy.utils.user_resource('CONFIG', path=os.path.join(get_package_name(), "ParseCache"))
+    return ParseCache(directory,
+                      max_size=prefs.parse_cache_size*0x100000,
+                      version=".".join(str(v) for v in get_addon_version()),
+                      enabled=prefs.use_parse_cache)
+
+
 class AddonPreferences(bpy.types.AddonPreferences):
     bl_idname = get_package_name()
 
@@ -74,6 +89,26 @@ class AddonPreferences(bpy.types.AddonPreferences):
         default=False
     )
     
+    use_parse_cache: bpy.props.BoolProperty(
+        name="Cache Parsed Files",
+        description="Store parsed files on disk so that re-importing an unchanged file skips parsing",
+        default=False
+    )
+    
+    parse_cache_directory: bpy.props.StringProperty(
+        name="Cache Directory",
+        description="Directory to store parsed files in. Uses a directory in the Blender user config folder if empty. Only files written by the current user are loaded from it",
+        subtype="DIR_PATH",
+        default=""
+    )
+    
+    parse_cache_size: bpy.props.IntProperty(
+        name="Cache Size (MB)",
+        description="Least-recently-used files are removed from the cache once it grows past this size",
+        min=1,
+        default=512
+    )
+    
     ############
     ## EXPORT ##
     ############
@@ -158,6 +193,11 @@ class AddonPreferences(bpy.types.AddonPreferences):
         import_col.prop(self, 'set_clip')
         import_col.prop(self, 'bone_pose')
         import_col.prop(self, 'connect_child_bones')
+        import_col.prop(self, 'use_parse_cache')
+        cache_col = import_col.column()
+        cache_col.enabled = self.use_parse_cache
+        cache_col.prop(self, 'parse_cache_directory')
+        cache_col.prop(self, 'parse_cache_size')
         
         export_col = io_row.column()
         export_col.label(text='Default Export settings:')
@@ -1,3 +1,5 @@
+from concurrent.futures import ProcessPoolExecutor
+
 from ...serialization.Serializable import Serializable
 from .SubComponents.GFS0ContainerBinary import GFS0ContainerBinary
 from .SubComponents.Textures.Binary import TexturePayload
@@ -13,10 +15,42 @@ class NotAGFSFileError(Exception):
         super().__init__(f"Not a GFS file - found incorrect magic value '{magic}'")
 
 
+def _decode_container_payload(version, ctr_type, size, raw_payload, collect_warnings):
+    """
+    Parses a single lazily-read container payload. Runs in the worker
+    processes of GFSBinary.decode_containers, so everything passed in and
+    returned must be picklable.
+    """
+    ctr = GFS0ContainerBinary()
+    ctr.version = version
+    ctr.type    = ctr_type
+    ctr.size    = size
+    ctr._raw_payload = raw_payload
+    warnings = [] if collect_warnings else None
+    ctr._lazy_warnings = warnings
+    ctr.parse_payload()
+    return ctr.data, warnings
+
+
 class GFSBinary(Serializable):
+    # Estimated time to decode a byte of model payload, whose vertex data is
+    # decoded in bulk, and the rough cost of decoding each payload byte of
+    # the other container types relative to it
+    MODEL_DECODE_SECONDS_PER_BYTE = 3e-9
+    DECODE_COST_WEIGHTS = {AnimationPayload.TYPECODE: 64,
+                           MaterialPayload.TYPECODE:  100,
+                           TexturePayload.TYPECODE:   0.25}
+    # Receiving a payload decoded by a worker costs this process roughly
+    # this fraction of the time it would take to decode it itself
+    RESULT_TRANSFER_RATIOS = {AnimationPayload.TYPECODE: 2.}
+    DEFAULT_RESULT_TRANSFER_RATIO = 0.5
+    # Time to start a pool whose workers have to import the addon, as on
+    # platforms that spawn rather than fork their worker processes
+    POOL_OVERHEAD_SECONDS = 0.25
+    
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.magic = b'GFS0'
         self.containers = []
@@ -24,12 +58,16 @@ class GFSBinary(Serializable):
     def __repr__(self):
         return f"[GFS] Has {len(self.containers)} container{'' if len(self.containers) == 1 else 's'}"
         
-    def read_write(self, rw, warnings=None):
+    def read_write(self, rw, warnings=None, lazy=False, workers=None):
         self.magic      = rw.rw_bytestring(self.magic, 4)
         if (self.magic != b'GFS0'):
             raise NotAGFSFileError(self.magic)
         
         if rw.mode() == "read":
+            # With several workers, every payload is first read lazily and
+            # then decoded in parallel once the whole file has been split
+            parallel = workers is not None and workers > 1 and not lazy
+            
             finished = False
             while not finished:
                 # Validation variable
@@ -38,7 +76,7 @@ class GFSBinary(Serializable):
                 # Read the data
                 ctr = GFS0ContainerBinary()
                 self.containers.append(ctr)
-                rw.rw_obj(ctr)
+                rw.rw_obj(ctr, lazy or parallel, warnings)
                 
                 # Validate container size
                 if ctr.size:
@@ -57,12 +95,63 @@ class GFSBinary(Serializable):
             else:
                 if rw.peek_bytestring(1) != b'':
                     warnings.append("Reached the end of the GFS file, but more data remains in the file")
+            
+            if parallel:
+                self.decode_containers(workers, warnings)
                 
         else:
             for ctr in self.containers:
                 rw.rw_obj(ctr)
 
 
+    def decode_containers(self, workers, warnings=None):
+        """
+        Parses every lazily-read container, spreading the payloads over a
+        pool of 'workers' processes whose results are pickled back to this
+        process. Files whose estimated decode time wouldn't cover the cost
+        of starting the pool are decoded sequentially.
+        """
+        pending = [ctr for ctr in self.containers if not ctr.is_parsed]
+        
+        # Unpickling a keyframe-heavy animation costs more than decoding
+        # it, so the most expensive container is decoded in this process
+        # while the workers get through the others
+        costs = [self.estimate_decode_seconds(ctr) for ctr in pending]
+        local_idx = max(range(len(pending)), key=costs.__getitem__, default=None)
+        remote = sorted((i for i in range(len(pending)) if i != local_idx), key=costs.__getitem__, reverse=True)
+        
+        # The pool can at best save the time this process would have spent
+        # decoding the remote payloads, less the time it takes to receive
+        # them back
+        saving = sum(costs[i] * (1 - self.RESULT_TRANSFER_RATIOS.get(pending[i].type, self.DEFAULT_RESULT_TRANSFER_RATIO)) for i in remote)
+        if workers < 2 or not len(remote) or saving < self.POOL_OVERHEAD_SECONDS:
+            for ctr in pending:
+                ctr.parse_payload()
+            return
+        
+        collect_warnings = warnings is not None
+        
+        results = [None]*len(pending)
+        with ProcessPoolExecutor(max_workers=min(workers - 1, len(remote))) as executor:
+            futures = {}
+            for i in remote:
+                ctr = pending[i]
+                futures[i] = executor.submit(_decode_container_payload, ctr.version, ctr.type, ctr.size, bytes(ctr.raw_payload), collect_warnings)
+            
+            ctr = pending[local_idx]
+            results[local_idx] = _decode_container_payload(ctr.version, ctr.type, ctr.size, ctr.raw_payload, collect_warnings)
+            for i, future in futures.items():
+                results[i] = future.result()
+        
+        for ctr, (data, ctr_warnings) in zip(pending, results):
+            ctr.data = data
+            if ctr_warnings:
+                warnings.extend(ctr_warnings)
+
+    @classmethod
+    def estimate_decode_seconds(cls, ctr):
+        return len(ctr.raw_payload) * cls.DECODE_COST_WEIGHTS.get(ctr.type, 1) * cls.MODEL_DECODE_SECONDS_PER_BYTE
+
     def get_container(self, ctr_type):
         for ctr in self.containers:
             if ctr.type == ctr_type:
@@ -80,7 +169,7 @@ class GFSBinary(Serializable):
 class EPLFileBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.magic = b'GFS0'
         self.start_block = GFS0ContainerBinary(endianness)
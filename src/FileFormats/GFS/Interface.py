@@ -1,4 +1,3 @@
-from ...serialization.BinaryTargets import OffsetTracker
 from .Binary import GFSBinary, EPLFileBinary
 from .SubComponents.GFS0ContainerBinary import GFS0ContainerBinary
 
@@ -75,15 +74,38 @@ class GFSInterface:
 
 
     @classmethod
-    def from_file(cls, filepath, warnings=None):
+    def from_file(cls, filepath, warnings=None, use_mmap=False, zero_copy=False, cache=None):
+        if cache is not None and cache.enabled:
+            with open(filepath, 'rb') as F:
+                bytes_ = F.read()
+            return cls.from_bytes(bytes_, warnings=warnings, use_mmap=use_mmap, zero_copy=zero_copy, cache=cache)
+        
         binary = GFSBinary()
-        binary.read(filepath, warnings=warnings)
+        binary.read(filepath, warnings=warnings, use_mmap=use_mmap, zero_copy=zero_copy)
         return cls.from_binary(binary, duplicate_data=False, warnings=warnings)
 
     @classmethod
-    def from_bytes(cls, bytes_, warnings=None):
+    def from_bytes(cls, bytes_, warnings=None, use_mmap=False, zero_copy=False, cache=None):
+        if cache is not None and cache.enabled:
+            key = cache.key_for(bytes_)
+            cached = cache.load(key, zero_copy=zero_copy)
+            if cached is not None:
+                instance, cached_warnings = cached
+                if warnings is not None:
+                    warnings.extend(cached_warnings)
+                return instance
+            
+            # Collect the warnings separately so that they can be replayed
+            # when the file is next loaded from the cache
+            parse_warnings = None if warnings is None else []
+            instance = cls.from_bytes(bytes_, warnings=parse_warnings, use_mmap=use_mmap, zero_copy=zero_copy)
+            cache.store(key, instance, parse_warnings)
+            if warnings is not None:
+                warnings.extend(parse_warnings)
+            return instance
+        
         binary = GFSBinary()
-        binary.unpack(bytes_, warnings=warnings)
+        binary.unpack(bytes_, warnings=warnings, use_mmap=use_mmap, zero_copy=zero_copy)
         return cls.from_binary(binary, duplicate_data=False, warnings=warnings)
 
     @classmethod
@@ -168,29 +190,35 @@ class GFSInterface:
     
 
     def to_file(self, filepath, anim_model_binary=None):
-        binary = self.to_binary(duplicate_data=True, anim_model_binary=anim_model_binary)
+        binary = self.to_binary(duplicate_data=True, anim_model_binary=anim_model_binary, calc_sizes=False)
         binary.write(filepath)
 
     def to_bytes(self, anim_model_binary=None):
-        binary = self.to_binary(duplicate_data=True, anim_model_binary=anim_model_binary)
+        binary = self.to_binary(duplicate_data=True, anim_model_binary=anim_model_binary, calc_sizes=False)
         return binary.pack()
 
-    def to_binary(self, duplicate_data=False, anim_model_binary=None):
+    def to_binary(self, duplicate_data=False, anim_model_binary=None, calc_sizes=True):
+        """
+        If calc_sizes is False, container sizes are left as None and are
+        backpatched by the Writer when the binary is written, which saves
+        a full pass over the object graph. Use it when the binary is only
+        going to be written out.
+        """
         binary = GFSBinary()
         
-        ot = OffsetTracker()
+        def calc_container_size(ctr):
+            if calc_sizes:
+                ctr.size = ctr.calc_size()
         
         # Start container
         start_ctr = GFS0ContainerBinary()
         start_ctr.version = self.version
         start_ctr.type = 0x00000001
-        ot.rw_obj(start_ctr)
         start_ctr.size = 0
         binary.containers.append(start_ctr)
         
         # Textures container
         if len(self.materials): # Unless textures are stored externally?
-            offset = ot.tell()
             tex_ctr = GFS0ContainerBinary()
             tex_ctr.version = self.version
             tex_ctr.type = 0x000100FC
@@ -199,13 +227,11 @@ class GFSInterface:
             tex_array.data = [ti.to_binary() for ti in self.textures]
             tex_array.count = len(tex_array.data)
             tex_ctr.data = tex_array
-            ot.rw_obj(tex_ctr)
-            tex_ctr.size = ot.tell() - offset
+            calc_container_size(tex_ctr)
             binary.containers.append(tex_ctr)
             
         # Materials container
         if len(self.materials):
-            offset = ot.tell()
             mat_ctr = GFS0ContainerBinary()
             mat_ctr.version = self.version
             mat_ctr.type = 0x000100FB
@@ -214,28 +240,24 @@ class GFSInterface:
             mat_array.data = [mi.to_binary() for mi in self.materials]
             mat_array.count = len(mat_array.data)
             mat_ctr.data = mat_array
-            ot.rw_obj(mat_ctr)
-            mat_ctr.size = ot.tell() - offset
+            calc_container_size(mat_ctr)
             binary.containers.append(mat_ctr)
             
         # Model container
         old_node_id_to_new_node_id_map = None
         if len(self.bones):
-            offset = ot.tell()
             mdl_ctr = GFS0ContainerBinary()
             mdl_ctr.version = self.version
             mdl_ctr.type = 0x00010003
             
             model_binary, old_node_id_to_new_node_id_map = ModelInterface.to_binary(self.bones, self.meshes, self.cameras, self.lights, self.epls, self.keep_bounding_box, self.keep_bounding_sphere, self.overrides, self.flag_3, copy_verts=duplicate_data)
             mdl_ctr.data = model_binary
-            ot.rw_obj(mdl_ctr)
-            mdl_ctr.size = ot.tell() - offset
+            calc_container_size(mdl_ctr)
             binary.containers.append(mdl_ctr)
         
         if ((len(self.animations) > 0) or
             (len(self.blend_animations) > 0) or 
             (self.lookat_animations is not None)):
-            offset = ot.tell()
             anm_ctr = GFS0ContainerBinary()
             anm_ctr.version = self.version
             anm_ctr.type = 0x000100FD
@@ -284,34 +306,28 @@ class GFSInterface:
             if anm_ctr.data.flags.has_lookat_anims:
                 anm_ctr.data.lookat_animations = self.lookat_animations.to_binary(anim_model_binary, old_node_id_to_new_node_id_map)
   
-            ot.rw_obj(anm_ctr)
-            anm_ctr.size = ot.tell() - offset
+            calc_container_size(anm_ctr)
             binary.containers.append(anm_ctr)
             
             
         # Physics container
         if self.physics_data is not None:
-            offset = ot.tell()
             physics_ctr = GFS0ContainerBinary()
             physics_ctr.version = self.version
             physics_ctr.type = 0x000100F9
             
             physics_ctr.data = self.physics_data
-            ot.rw_obj(physics_ctr)
-            physics_ctr.size = ot.tell() - offset
+            calc_container_size(physics_ctr)
             binary.containers.append(physics_ctr)
             
         # Unknown container
         if self.data_0x000100F8 is not None:
-            offset = ot.tell()
             unk_ctr = GFS0ContainerBinary()
             unk_ctr.version = self.version
             unk_ctr.type = 0x000100F8
             
             unk_ctr.data = self.data_0x000100F8
             unk_ctr.size = len(self.data_0x000100F8.data) + 0x10
-            # ot.rw_obj(unk_ctr)
-            # unk_ctr.size = ot.tell() - offset
             binary.containers.append(unk_ctr)
         
         # End container
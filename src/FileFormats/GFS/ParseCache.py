@@ -0,0 +1,346 @@
+import gc
+import hashlib
+import io
+import json
+import os
+import pickle
+import stat
+import struct
+import sys
+
+
+def _without_gc(func, *args):
+    # Unpickling creates a very large number of objects in one go, none of
+    # which can be garbage, so the collector only adds overhead
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return func(*args)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _CachePickler(pickle.Pickler):
+    """
+    Pickles large bytestrings and memoryviews, such as texture data, by
+    reference so that they can be stored alongside the out-of-band buffers
+    rather than being copied into the metadata stream.
+    """
+    def __init__(self, file, buffers, blobs):
+        super().__init__(file, protocol=5, buffer_callback=buffers.append)
+        self.blobs = blobs
+
+    def persistent_id(self, obj):
+        if type(obj) in (bytes, memoryview) and len(obj) >= ParseCache.BLOB_THRESHOLD:
+            self.blobs.append(obj)
+            return len(self.blobs) - 1
+        return None
+
+
+# Classes defined anywhere in the addon can be unpickled, but the only
+# other globals a cache entry may name are these reconstructors
+_PACKAGE_PREFIX = __name__[:-len("FileFormats.GFS.ParseCache")]
+_SAFE_GLOBALS = {
+    ("array", "array"),
+    ("array", "_array_reconstructor"),
+    ("builtins", "bytearray"),
+    ("builtins", "frozenset"),
+    ("builtins", "set"),
+    ("numpy", "dtype"),
+    ("numpy", "ndarray"),
+    ("numpy.core.multiarray", "_reconstruct"),
+    ("numpy.core.multiarray", "scalar"),
+    ("numpy.core.numeric", "_frombuffer"),
+    ("numpy._core.multiarray", "_reconstruct"),
+    ("numpy._core.multiarray", "scalar"),
+    ("numpy._core.numeric", "_frombuffer"),
+}
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    """
+    Only resolves the globals that the addon's own objects pickle to, so
+    that a cache entry can't name an arbitrary callable to run on load.
+    """
+    def __init__(self, file, buffers, blobs):
+        super().__init__(file, buffers=buffers)
+        self.blobs = blobs
+
+    def persistent_load(self, pid):
+        return self.blobs[pid]
+
+    def find_class(self, module, name):
+        if (module, name) in _SAFE_GLOBALS:
+            return super().find_class(module, name)
+        if module.startswith(_PACKAGE_PREFIX) and "." not in name:
+            obj = super().find_class(module, name)
+            if isinstance(obj, type):
+                return obj
+        raise pickle.UnpicklingError(f"Cache entry refers to disallowed global '{module}.{name}'")
+
+
+class ParseCache:
+    """
+    An on-disk cache of parsed files, keyed by a hash of the file contents
+    and the version of the code that parsed them.
+
+    Each entry is stored as two files:
+        <key>.meta: a length-prefixed JSON header followed by the pickled
+                    object graph.
+        <key>.bin:  the raw contents of every NumPy array and large
+                    bytestring in the object, each padded to an aligned
+                    offset.
+    Loading an entry reads the .bin file in one go and hands slices of it
+    back to the unpickler, so bulk data is never decoded element-by-element.
+    Entries are evicted least-recently-used first once the total size of
+    the cache exceeds max_size.
+
+    The cache defaults to a per-user directory, created readable only by
+    its owner. Entries are only loaded from a directory and files owned by
+    the current user, and the unpickler only accepts the addon's own
+    classes plus a few array reconstructors.
+
+    Usage:
+        cache = ParseCache(directory, version="0.2.0")
+        gfs = GFSInterface.from_file(filepath, cache=cache)
+    """
+    FORMAT_VERSION = 2
+    BLOB_THRESHOLD = 0x1000
+    ALIGNMENT      = 0x10
+    HEADER_SIZE    = struct.Struct("<I")
+
+    def __init__(self, directory=None, max_size=0x20000000, version=None, enabled=True):
+        if directory is None or directory == "":
+            directory = self.default_directory()
+        self.directory = directory
+        self.max_size  = max_size
+        self.version   = version
+        self.enabled   = enabled
+
+    def __repr__(self):
+        return f"[GFS::ParseCache] {self.directory} {'enabled' if self.enabled else 'disabled'}"
+
+    @property
+    def version_tag(self):
+        return f"{self.FORMAT_VERSION}:{self.version}:{sys.version_info[0]}.{sys.version_info[1]}"
+
+    def key_for(self, data):
+        hasher = hashlib.blake2b(data, digest_size=20)
+        hasher.update(self.version_tag.encode("utf8"))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def default_directory():
+        """
+        The platform's cache directory for the current user. Unlike the
+        system temporary directory, it isn't writable by other users.
+        """
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        elif sys.platform == "darwin":
+            root = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+        else:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(root, "GFSParseCache")
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".meta", base + ".bin"
+
+    @staticmethod
+    def _is_owned(path):
+        """
+        Whether 'path' is owned by the current user and isn't a symlink. On
+        platforms without POSIX ownership, such as Windows, the per-user
+        default directory is protected by its access control list instead.
+        """
+        if not hasattr(os, "getuid"):
+            return True
+        try:
+            path_stat = os.lstat(path)
+        except OSError:
+            return False
+        return path_stat.st_uid == os.getuid() and not stat.S_ISLNK(path_stat.st_mode)
+
+    def _is_trusted_directory(self):
+        if not hasattr(os, "getuid"):
+            return True
+        try:
+            return os.stat(self.directory).st_uid == os.getuid()
+        except OSError:
+            return False
+
+    ###########
+    # Entries #
+    ###########
+
+    def load(self, key, zero_copy=False):
+        """
+        Returns (obj, warnings) for a cached entry, or None if there is no
+        valid entry for the key. If zero_copy is set, data that was stored
+        from a memoryview, such as zero-copy texture data, is returned as a
+        memoryview of the loaded buffer rather than as bytes.
+        """
+        if not self.enabled:
+            return None
+        meta_path, bin_path = self._paths(key)
+        if not os.path.isfile(meta_path):
+            return None
+        # Never load, or delete, an entry that another user could have
+        # written
+        if not (self._is_trusted_directory() and self._is_owned(meta_path) and self._is_owned(bin_path)):
+            return None
+
+        try:
+            with open(meta_path, 'rb') as F:
+                header_size, = self.HEADER_SIZE.unpack(F.read(self.HEADER_SIZE.size))
+                header = json.loads(F.read(header_size).decode("utf8"))
+                if header["key"] != key or header["version"] != self.version_tag:
+                    raise ValueError(f"Cache entry '{key}' does not match its filename")
+
+                bin_size = os.path.getsize(bin_path)
+                if bin_size != header["bin_size"]:
+                    raise ValueError(f"Cache entry '{key}' has {bin_size} bytes of buffers, expected {header['bin_size']}")
+                raw = bytearray(bin_size)
+                with open(bin_path, 'rb') as B:
+                    B.readinto(raw)
+                view = memoryview(raw)
+
+                buffers = [view[offset:offset+size] for offset, size in header["buffers"]]
+                # Bytestrings may be arguments to reconstructors that only
+                # accept bytes, so only memoryviews are returned zero-copy
+                blobs   = [view[offset:offset+size] if (zero_copy and is_view) else bytes(view[offset:offset+size])
+                           for offset, size, is_view in header["blobs"]]
+
+                obj = _without_gc(_CacheUnpickler(F, buffers, blobs).load)
+        except Exception:
+            # A damaged or stale entry is a cache miss, never an import
+            # failure
+            self.remove(key)
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return obj, list(header["warnings"])
+
+    def store(self, key, obj, warnings=None):
+        """
+        Writes an entry for the key, then evicts old entries if the cache
+        is over its size limit. Returns whether the entry was written.
+        """
+        if not self.enabled:
+            return False
+        meta_path, bin_path = self._paths(key)
+        suffix = f".{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            if not self._is_trusted_directory():
+                return False
+
+            buffers = []
+            blobs   = []
+            tmp_meta_path = meta_path + suffix
+            with open(tmp_meta_path, 'wb') as F:
+                # Pickle the object graph first so that the header can
+                # record where each buffer ends up in the .bin file
+                stream = io.BytesIO()
+                _without_gc(_CachePickler(stream, buffers, blobs).dump, obj)
+
+                layout = {"buffers": [], "blobs": []}
+                offset = 0
+                chunks = []
+                items = [("buffers", buf.raw(), ()) for buf in buffers] \
+                      + [("blobs", memoryview(blob).cast('B'), (type(blob) is memoryview,)) for blob in blobs]
+                for name, item, extra in items:
+                    padding = (-offset) % self.ALIGNMENT
+                    if padding:
+                        chunks.append(bytes(padding))
+                        offset += padding
+                    layout[name].append((offset, item.nbytes, *extra))
+                    chunks.append(item)
+                    offset += item.nbytes
+
+                header = {
+                    "key":      key,
+                    "version":  self.version_tag,
+                    "bin_size": offset,
+                    "buffers":  layout["buffers"],
+                    "blobs":    layout["blobs"],
+                    "warnings": list(warnings) if warnings is not None else []
+                }
+                header = json.dumps(header).encode("utf8")
+                F.write(self.HEADER_SIZE.pack(len(header)))
+                F.write(header)
+                F.write(stream.getbuffer())
+
+            tmp_bin_path = bin_path + suffix
+            with open(tmp_bin_path, 'wb') as B:
+                for chunk in chunks:
+                    B.write(chunk)
+
+            os.replace(tmp_bin_path, bin_path)
+            os.replace(tmp_meta_path, meta_path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, ValueError):
+            for path in (meta_path + suffix, bin_path + suffix):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return False
+
+        self.evict()
+        return True
+
+    def remove(self, key):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    ###############
+    # Maintenance #
+    ###############
+
+    def entries(self):
+        """
+        Returns [(last used time, total size, key)] for every entry in the
+        cache, least-recently-used first.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".meta"):
+                continue
+            key = filename[:-len(".meta")]
+            meta_path, bin_path = self._paths(key)
+            try:
+                stat = os.stat(meta_path)
+                size = stat.st_size + (os.path.getsize(bin_path) if os.path.isfile(bin_path) else 0)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, size, key))
+        entries.sort()
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size:
+                break
+            self.remove(key)
+            total -= size
+
+    def clear(self):
+        for _, _, key in self.entries():
+            self.remove(key)
@@ -7,7 +7,7 @@ from .AnimTrack import AnimationTrackBinary
 class AnimationControllerBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.target_id = None
@@ -1,4 +1,5 @@
 from ......serialization.Serializable import Serializable
+from ......serialization.Compiler import fixed_layout
 from ......serialization.utils import safe_format, hex32_format
 
 
@@ -13,10 +14,21 @@ class MaterialAnimationType:
     MATERIAL_EMISSION_RGB = 14
 
 
+_keyframe_strides = {}
+def get_keyframe_stride(kf_type):
+    """
+    Returns the serialised size of a single keyframe of the given type. All
+    keyframe types are fixed-size, so this only needs to be measured once.
+    """
+    if kf_type not in _keyframe_strides:
+        _keyframe_strides[kf_type] = kf_type().calc_size()
+    return _keyframe_strides[kf_type]
+
+
 class AnimationTrackBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.keyframe_type = None
         self.keyframe_count = None
@@ -30,10 +42,7 @@ class AnimationTrackBinary(Serializable):
     def __repr__(self):
         return f"[GFDBinary::Animation::Controller::Track {safe_format(self.keyframe_type, hex32_format)}] Keyframes: {self.keyframe_count}"
 
-    def read_write(self, rw, version):
-        self.keyframe_type  = rw.rw_uint32(self.keyframe_type)
-        self.keyframe_count = rw.rw_uint32(self.keyframe_count)
-        self.frames = rw.rw_float32s(self.frames, self.keyframe_count)
+    def get_keyframe_type(self):
         # Should use this to decide which "keyframe attributes" to r/w?
         # Need to figure out all kf attributes first since many overlap..?
         if   self.keyframe_type == 1:  kf_type = NodeTR         # Node Anim: Only in extra data?
@@ -73,6 +82,22 @@ class AnimationTrackBinary(Serializable):
         elif self.keyframe_type == 35: kf_type = NodeRSHalf
         elif self.keyframe_type == 36: kf_type = Tex1UVSnap     # Material Anim: 0x1105100         
         else: raise NotImplementedError(f"Unknown Keyframe type: '{self.keyframe_type}'")
+        return kf_type
+
+    def size_of(self, version):
+        if self.keyframe_count is None:
+            return None
+        size = 8 + 4*self.keyframe_count
+        size += self.keyframe_count*get_keyframe_stride(self.get_keyframe_type())
+        if self.keyframe_type in [26, 27, 28, 31, 32, 33, 34, 35]:
+            size += 24
+        return size
+
+    def read_write(self, rw, version):
+        self.keyframe_type  = rw.rw_uint32(self.keyframe_type)
+        self.keyframe_count = rw.rw_uint32(self.keyframe_count)
+        self.frames = rw.rw_float32s(self.frames, self.keyframe_count)
+        kf_type = self.get_keyframe_type()
             
         try:
             self.values = rw.rw_obj_array(self.values, kf_type, self.keyframe_count)
@@ -92,7 +117,7 @@ class AnimationTrackBinary(Serializable):
 class TexUVKeyframe(Serializable):
     def __init__(self, transforms=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         if transforms is None:
             self.translate_u = 0.
@@ -120,7 +145,7 @@ class TexUVKeyframe(Serializable):
 class ColorKeyframe(Serializable):
     def __init__(self, color=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         if color is None:
             self.r = 1.
@@ -146,7 +171,7 @@ class NodeTR(Serializable):
         
     def __init__(self, position=None, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -154,6 +179,7 @@ class NodeTR(Serializable):
     def __repr__(self):
         return f"[GFDBinary::Animation::Controller::Track::KeyframeType1] {self.position} {self.rotation}"
         
+    @fixed_layout
     def read_write(self, rw):
         self.position = rw.rw_float32s(self.position, 3)
         self.rotation = rw.rw_float32s(self.rotation, 4)
@@ -165,7 +191,7 @@ class NodeTRS(Serializable):
     
     def __init__(self, position=None, rotation=None, scale=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -174,6 +200,7 @@ class NodeTRS(Serializable):
     def __repr__(self):
         return f"[GFDBinary::Animation::Controller::Track::KeyframeType2] {self.position} {self.rotation} {self.scale}"
         
+    @fixed_layout
     def read_write(self, rw):
         self.position = rw.rw_float32s(self.position, 3)
         self.rotation = rw.rw_float32s(self.rotation, 4)
@@ -187,7 +214,7 @@ class KeyframeType3(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -203,7 +230,7 @@ class KeyframeType4(Serializable):
     
     def __init__(self, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.rotation = rotation
         
@@ -219,7 +246,7 @@ class KeyframeType5(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -252,7 +279,7 @@ class SpecularPower(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -268,7 +295,7 @@ class KeyframeType10(Serializable):
     
     def __init__(self, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.rotation = rotation
         
@@ -286,7 +313,7 @@ class KeyframeType11(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -302,7 +329,7 @@ class Opacity(Serializable):
     
     def __init__(self, opacity=1, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.opacity = opacity
         
@@ -330,7 +357,7 @@ class KeyframeType15(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -348,7 +375,7 @@ class KeyframeType16(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -364,7 +391,7 @@ class KeyframeType17(Serializable):
     
     def __init__(self, position=None, rotation=None, scale=None, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -387,7 +414,7 @@ class KeyframeType18(Serializable):
     
     def __init__(self, unknown_0x00=None, unknown_0x04=None, unknown_0x08=None, unknown_0x0C=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = unknown_0x00
         self.unknown_0x04 = unknown_0x04
@@ -410,7 +437,7 @@ class KeyframeType19(Serializable):
     
     def __init__(self, unknown_1=None, unknown_2=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_1 = unknown_1
         self.unknown_2 = unknown_2
@@ -441,7 +468,7 @@ class KeyframeType22(Serializable):
                  unknown_0x16=None, unknown_0x1A=None, unknown_0x1C=None,
                  unknown_0x20=None, unknown_0x24=None, unknown_0x28=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = unknown_0x00
         self.unknown_0x04 = unknown_0x04
@@ -480,7 +507,7 @@ class KeyframeType23(Serializable):
     
     def __init__(self, fov=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.camera_fov = fov
         
@@ -497,7 +524,7 @@ class KeyframeType24(Serializable):
     
     def __init__(self, unknown_float=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_float = unknown_float
         
@@ -513,7 +540,7 @@ class OpacitySnap(Serializable):
     
     def __init__(self, opacity=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.opacity = opacity
         
@@ -529,7 +556,7 @@ class KeyframeType26(Serializable): # What is different about this one and 28?!
     
     def __init__(self, position=None, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -547,7 +574,7 @@ class NodeTRSHalf(Serializable):
     
     def __init__(self, position=None, rotation=None, scale=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -556,6 +583,7 @@ class NodeTRSHalf(Serializable):
     def __repr__(self):
         return f"[GFDBinary::Animation::Controller::Track::NodeTRSHalf] {self.position} {self.rotation} {self.scale}"
         
+    @fixed_layout
     def read_write(self, rw):
         self.position = rw.rw_float16s(self.position, 3)
         self.rotation = rw.rw_float16s(self.rotation, 4)
@@ -568,7 +596,7 @@ class KeyframeType28(Serializable):
     
     def __init__(self, position=None, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.rotation = rotation
@@ -587,7 +615,7 @@ class KeyframeType29(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown = unknown
         
@@ -604,7 +632,7 @@ class KeyframeType30(Serializable):
     
     def __init__(self, unknown=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_float = unknown
         
@@ -620,7 +648,7 @@ class NodeTHalf(Serializable):
     
     def __init__(self, position=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         
@@ -637,7 +665,7 @@ class NodeRHalf(Serializable):
     
     def __init__(self, rotation=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.rotation = rotation
         
@@ -654,7 +682,7 @@ class NodeSHalf(Serializable):
     
     def __init__(self, scale=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.scale = scale
         
@@ -671,7 +699,7 @@ class NodeTSHalf(Serializable):
     
     def __init__(self, position=None, scale=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.position = position
         self.scale = scale
@@ -689,7 +717,7 @@ class NodeRSHalf(Serializable):
     
     def __init__(self, rotation=None, scale=None, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.rotation = rotation
         self.scale = scale
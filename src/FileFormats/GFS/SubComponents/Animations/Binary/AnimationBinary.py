@@ -1,6 +1,8 @@
+import numpy as np
+
 from ......serialization.Serializable import Serializable
 from ......serialization.utils import safe_format, hex32_format
-from ....Utils.Matrices import transforms_to_matrix, multiply_transform_matrices, transform_vector
+from ....Utils.Matrices import transform_vector_batch
 from ...CommonStructures.SceneNode.EPL import EPLBinary
 from ...CommonStructures import ObjectName, PropertyBinary, BitVector
 from ...CommonStructures.SizedObjArrayModule import SizedObjArray
@@ -49,9 +51,12 @@ class AnimationFlags(BitVector):
 
 
 class AnimationBinary(Serializable):
+    # Number of frames posed at once when calculating the bounding box
+    BOUNDING_BOX_BATCH_SIZE = 256
+    
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags       = AnimationFlags()
         self.duration    = None
@@ -90,10 +95,22 @@ class AnimationBinary(Serializable):
             rw.rw_obj(self.properties, version)
             
     def calc_bounding_box(self, model_binary):
-        def get_frame(dct, frame):
-            smaller_frames = [f for f in dct if f <= frame]
-            smallest_frame = max(smaller_frames) if len(smaller_frames) else list(dct.keys())[0]
-            return dct[smallest_frame]
+        def make_sampler(dct):
+            # Samples the keyframe at or before each frame, without
+            # interpolation; frames before the first key take the value of
+            # the first key stored
+            if not len(dct):
+                return None
+            keys   = sorted(dct)
+            values = np.array([dct[k] for k in keys], dtype=np.float64)
+            first  = np.array(next(iter(dct.values())), dtype=np.float64)
+            keys   = np.array(keys)
+            def sample(frames):
+                idx = np.searchsorted(keys, frames, side='right')
+                out = values[np.maximum(idx - 1, 0)]
+                out[idx == 0] = first
+                return out
+            return sample
             
         # Get all relevant frames
         all_frames = set()
@@ -103,68 +120,55 @@ class AnimationBinary(Serializable):
                 continue
             for track in controller.tracks:
                 all_frames.update(set(track.frames))
-            node_anims.append(NodeAnimation.from_controller(controller))
-        all_frames = sorted(all_frames)
+            anim = NodeAnimation.from_controller(controller)
+            node_anims.append((anim.id, make_sampler(anim.positions), make_sampler(anim.rotations), make_sampler(anim.scales)))
+        all_frames = np.array(sorted(all_frames))
         
         # Flatten the node structure
         flat_nodes = model_binary.root_node.flattened()
+        skeleton   = model_binary.get_skeleton(flat_nodes)
         
         # Collect all bounding box vertices
-        mesh_verts = []
+        mesh_node_indices = []
+        mesh_verts        = []
         for node_idx, mesh in flat_nodes.meshes:
             if not mesh.flags.has_bounding_box:
                 continue
-            min_dims = mesh.bounding_box_min_dims
-            max_dims = mesh.bounding_box_max_dims
-            mesh_verts.append((node_idx, min_dims, max_dims))
+            mesh_node_indices.extend((node_idx, node_idx))
+            mesh_verts.append(mesh.bounding_box_min_dims)
+            mesh_verts.append(mesh.bounding_box_max_dims)
+        mesh_node_indices = np.array(mesh_node_indices, dtype=np.intp)
+        mesh_verts        = np.array(mesh_verts, dtype=np.float64).reshape((-1, 3))
+        
+        # Now measure the bounding box of the model over every frame,
+        # evaluating the frames in batches
+        global_min = [0, 0, 0]
+        global_max = [0, 0, 0]
+        if not len(all_frames) or not (len(mesh_verts) or len(skeleton)):
+            return global_min, global_max
         
-        # Now measure the bounding box of the model on each frame
         frame_minima = []
         frame_maxima = []
-        for frame_idx, frame in enumerate(all_frames):
-            bone_data = [[b.position, b.rotation, b.scale] for b in flat_nodes.nodes]
-            # Do the animation without interpolation since that sounds like
-            # what might have been done
-            for anim in node_anims:
-                if len(anim.positions): bone_data[anim.id][0] = get_frame(anim.positions, frame)
-                if len(anim.rotations): bone_data[anim.id][1] = get_frame(anim.rotations, frame)
-                if len(anim.scales):    bone_data[anim.id][2] = get_frame(anim.scales,    frame)
-            
-            # Build bone matrices for the frame
-            bone_matrices = [None for _ in range(len(flat_nodes.nodes))]
-            for i, (bone, bd) in enumerate(zip(flat_nodes.nodes, bone_data)):
-                matrix = transforms_to_matrix(*bd)
-                parent_idx = flat_nodes.node_parents[i]
-                if parent_idx > -1:
-                    bone_matrices[i] = multiply_transform_matrices(bone_matrices[parent_idx], matrix)
-                else:
-                    bone_matrices[i] = matrix
+        for batch_start in range(0, len(all_frames), self.BOUNDING_BOX_BATCH_SIZE):
+            frames = all_frames[batch_start:batch_start+self.BOUNDING_BOX_BATCH_SIZE]
+            positions, rotations, scales = skeleton.rest_transforms(len(frames))
+            for node_idx, sample_positions, sample_rotations, sample_scales in node_anims:
+                if sample_positions is not None: positions[:, node_idx] = sample_positions(frames)
+                if sample_rotations is not None: rotations[:, node_idx] = sample_rotations(frames)
+                if sample_scales    is not None: scales   [:, node_idx] = sample_scales   (frames)
             
-            # Now do bounding box transforms
-            bbox_verts = [None for _ in range(len(mesh_verts)*2)]
-            for i, (node_idx, min_v, max_v) in enumerate(mesh_verts):
-                bbox_verts[2*i+0] = transform_vector(bone_matrices[node_idx], min_v)
-                bbox_verts[2*i+1] = transform_vector(bone_matrices[node_idx], max_v)
+            # Build bone matrices for every frame, then do bounding box
+            # transforms
+            bone_matrices = skeleton.poses_array(positions, rotations, scales)
+            bbox_verts    = transform_vector_batch(bone_matrices[:, mesh_node_indices], mesh_verts)
             
-            # Identify bounding box for this frame
-            min_v = [0, 0, 0]
-            max_v = [0, 0, 0]
-            if len(bbox_verts) or len(bone_matrices):
-                for pidx in range(3):
-                    dataset = [*[m[3 + 4*pidx] for m in bone_matrices], *[v[pidx] for v in bbox_verts]]
-                    min_v[pidx] = min(dataset)
-                    max_v[pidx] = max(dataset)
-            
-            frame_minima.append(min_v)
-            frame_maxima.append(max_v)
+            dataset = np.concatenate([bone_matrices[:, :, :, 3], bbox_verts], axis=1)
+            frame_minima.append(dataset.min(axis=1))
+            frame_maxima.append(dataset.max(axis=1))
         
         # Export global min/max
-        global_min = [0, 0, 0]
-        global_max = [0, 0, 0]
-        if len(frame_minima):
-            for pidx in range(3):
-                global_min[pidx] = min([v[pidx] for v in frame_minima])
-                global_max[pidx] = max([v[pidx] for v in frame_maxima])
+        global_min = np.concatenate(frame_minima).min(axis=0).tolist()
+        global_max = np.concatenate(frame_maxima).max(axis=0).tolist()
         return global_min, global_max
 
     def autocalc_bounding_box(self, model_binary):   
@@ -176,7 +180,7 @@ class AnimationBinary(Serializable):
 class EPLEntry(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.epl = EPLBinary.EPLBinary(endianness)
         self.name = ObjectName(endianness)
@@ -189,7 +193,7 @@ class EPLEntry(Serializable):
 class LookAtAnimationsBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.right        = AnimationBinary(endianness)
         self.right_factor = None
@@ -217,7 +221,7 @@ class LookAtAnimationsBinary(Serializable):
 class ExtraTrackData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = None
         self.name = ObjectName(endianness)
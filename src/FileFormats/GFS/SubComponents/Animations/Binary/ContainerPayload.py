@@ -63,7 +63,7 @@ class AnimationPayload(Serializable):
     
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags              = AnimationPackFlags()
         self.animations         = SizedObjArray(AnimationBinary)
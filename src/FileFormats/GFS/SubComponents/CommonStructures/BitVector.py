@@ -8,7 +8,7 @@ class BitVector(Serializable):
     
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self._value = 0
         
@@ -72,7 +72,7 @@ class BitChunkVector(Serializable):
     
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self._value = self.DEFAULT
         
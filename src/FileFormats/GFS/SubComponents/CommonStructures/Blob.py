@@ -9,5 +9,8 @@ class Blob(Serializable):
     def __repr__(self):
         return f"[GFS::Blob] {len(self.data)}"
     
+    def size_of(self, version, size):
+        return size
+    
     def read_write(self, rw, version, size):
         self.data = rw.rw_bytestring(self.data, size)
@@ -7,7 +7,7 @@ class PropertyBinary(Serializable):
     
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.name = ObjectName(endianness)
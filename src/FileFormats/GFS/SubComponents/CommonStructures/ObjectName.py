@@ -8,7 +8,7 @@ all_strings_and_hashes = set()
 class ObjectName(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.string_size = None
         self.string      = None
@@ -40,6 +40,14 @@ class ObjectName(Serializable):
         if version > 0x01080010:
             self.rw_hash(rw, encoding)
 
+    def size_of(self, version, encoding="utf8"):
+        if self.string_size is None:
+            return None
+        size = 2 + self.string_size
+        if version > 0x01080010 and self.string_size > 0:
+            size += 4
+        return size
+
     def rw_hash(self, rw, encoding):
         if self.string_size > 0:
             self.string_hash = rw.rw_uint32(self.string_hash)
@@ -59,7 +67,7 @@ class ObjectName(Serializable):
     def _read_string(self, rw, string, encoding):
         tmp = rw.rw_bytestring(string, self.string_size)
         try:
-            out = tmp.decode(encoding)
+            out = rw.decode_str(tmp, encoding)
         except UnicodeDecodeError as e:
             if tmp[-28:] == b'DirectX \xe3\x83\x9e\xe3\x83\x8d\xe3\x83\xbc\xe3\x82\xb8\xe3\x83\xa3.\x97L\x8c\xf8':
                 out = tmp[:-4].decode("utf-8") + tmp[-4:].decode("shift-jis")
@@ -5,7 +5,7 @@ from .......serialization.utils import safe_format
 class CameraBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.view_matrix = None
         self.zNear = None
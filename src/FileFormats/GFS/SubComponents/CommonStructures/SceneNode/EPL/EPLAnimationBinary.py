@@ -43,7 +43,7 @@ class EPLAnimationFlags(BitVector0x20):
 class EPLAnimationBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = EPLAnimationFlags()
         self.unknown_0x04 = None
@@ -62,7 +62,7 @@ class EPLAnimationBinary(Serializable):
 class EPLAnimationController(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -43,7 +43,7 @@ class EPLFlags(BitVector0x20):
 class EPLBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = EPLFlags()
         self.root_node = NodeBinary.SceneNodeBinary(endianness)
@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafBoardPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -45,7 +45,7 @@ class EPLLeafBoardPolygon(Serializable):
 class EPLSquareBoardPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = EPLLeafCommonData2(endianness)
@@ -75,7 +75,7 @@ class EPLSquareBoardPolygon(Serializable):
 class EPLRectangleBoardPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = EPLLeafCommonData2(endianness)
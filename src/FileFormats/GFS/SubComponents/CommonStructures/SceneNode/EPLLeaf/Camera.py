@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafCamera(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -41,7 +41,7 @@ class EPLLeafCamera(Serializable):
 class EPLCameraMeshParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
     def read_write(self, rw, version):
         pass
@@ -50,7 +50,7 @@ class EPLCameraMeshParams(Serializable):
 class EPLCameraQuakeParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2
 class EPLLeafCirclePolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.unknown_0x04 = None
@@ -59,7 +59,7 @@ class EPLLeafCirclePolygon(Serializable):
 class EPLCirclePolygonRing(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -84,7 +84,7 @@ class EPLCirclePolygonRing(Serializable):
 class EPLCirclePolygonTrajectory(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -111,7 +111,7 @@ class EPLCirclePolygonTrajectory(Serializable):
 class EPLCirclePolygonFill(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -128,7 +128,7 @@ class EPLCirclePolygonFill(Serializable):
 class EPLCirclePolygonHoop(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
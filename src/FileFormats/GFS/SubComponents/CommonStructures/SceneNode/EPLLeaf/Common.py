@@ -5,7 +5,7 @@ from ....CommonStructures import ObjectName
 class EPLEmbeddedFile(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.name = ObjectName()
         self.unknown_0x04 = None
@@ -25,7 +25,7 @@ class EPLEmbeddedFile(Serializable):
 class EPLLeafCommonData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.payload = None
@@ -52,7 +52,7 @@ class EPLLeafCommonData(Serializable):
 class EPLLeafCommonData2(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.payload = None
@@ -79,7 +79,7 @@ class EPLLeafCommonData2(Serializable):
 class ParticleEmitter(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -162,7 +162,7 @@ class ParticleEmitter(Serializable):
 class EplSmokeEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -183,7 +183,7 @@ class EplSmokeEffectParams(Serializable):
 class EPLExplosionEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x08 = None
@@ -204,7 +204,7 @@ class EPLExplosionEffectParams(Serializable):
 class EPLSpiralEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -227,7 +227,7 @@ class EPLSpiralEffectParams(Serializable):
 class EPLBallEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x08 = None
@@ -246,7 +246,7 @@ class EPLBallEffectParams(Serializable):
 class EPLCircleEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x08 = None
@@ -269,7 +269,7 @@ class EPLCircleEffectParams(Serializable):
 class EPLStraightLineEffectParams(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafDirectionalParticles(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
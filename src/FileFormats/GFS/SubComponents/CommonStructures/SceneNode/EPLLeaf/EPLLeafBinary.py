@@ -56,7 +56,7 @@ class EPLLeafFlags(BitVector0x20):
 class EPLLeafBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = EPLLeafFlags()
         self.name = ObjectName(endianness)
@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2
 class EPLLeafFlashPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.unknown_0x00 = None
@@ -68,7 +68,7 @@ class EPLLeafFlashPolygon(Serializable):
 class EPLFlashPolygonRadiation(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -93,7 +93,7 @@ class EPLFlashPolygonRadiation(Serializable):
 class EPLFlashPolygonExplosion(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x08 = None
@@ -117,7 +117,7 @@ class EPLFlashPolygonExplosion(Serializable):
 class EPLFlashPolygonRing(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -149,7 +149,7 @@ class EPLFlashPolygonRing(Serializable):
 class EPLFlashPolygonSplash(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -179,7 +179,7 @@ class EPLFlashPolygonSplash(Serializable):
 class EPLFlashPolygonCylinder(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = None
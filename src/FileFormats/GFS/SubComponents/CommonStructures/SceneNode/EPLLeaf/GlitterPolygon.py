@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafGlitterPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -78,7 +78,7 @@ class EPLLeafGlitterPolygon2(EPLLeafGlitterPolygon):
 class EPLGlitterPolygonExplosion(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = None
         self.unknown_0x08 = None
@@ -97,7 +97,7 @@ class EPLGlitterPolygonExplosion(Serializable):
 class EPLGlitterPolygonSplash(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -118,7 +118,7 @@ class EPLGlitterPolygonSplash(Serializable):
 class EPLGlitterPolygonCylinder(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = None
@@ -144,7 +144,7 @@ class EPLGlitterPolygonCylinder(Serializable):
 class EPLGlitterPolygonWall(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = None
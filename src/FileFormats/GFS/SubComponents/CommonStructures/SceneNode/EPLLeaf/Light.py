@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafLight(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -39,7 +39,7 @@ class EPLLeafLight(Serializable):
 class EplLightMeshData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
     def read_write(self, rw, version):
         pass
@@ -48,7 +48,7 @@ class EplLightMeshData(Serializable):
 class EplLightSceneData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = None
         self.unknown_0x04 = None
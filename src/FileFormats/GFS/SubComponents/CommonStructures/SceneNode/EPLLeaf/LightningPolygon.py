@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2
 class EPLLeafLightningPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -71,7 +71,7 @@ class EPLLeafLightningPolygon(Serializable):
 class EPLLightningPolygonRod(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         
@@ -82,7 +82,7 @@ class EPLLightningPolygonRod(Serializable):
 class EPLLightningPolygonBall(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = None
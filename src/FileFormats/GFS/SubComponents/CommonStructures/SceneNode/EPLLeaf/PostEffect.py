@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafPostEffect(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -55,7 +55,7 @@ class EPLLeafPostEffect(Serializable):
 class EplPostEffectRadiationBlurData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
@@ -80,7 +80,7 @@ class EplPostEffectRadiationBlurData(Serializable):
 class EplPostEffectStraightBlurData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
@@ -97,7 +97,7 @@ class EplPostEffectStraightBlurData(Serializable):
 class EplPostEffectNoiseBlurData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
@@ -117,7 +117,7 @@ class EplPostEffectNoiseBlurData(Serializable):
 class EplPostEffectDistortionBlurData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
@@ -143,7 +143,7 @@ class EplPostEffectDistortionBlurData(Serializable):
 class EplPostEffectFillData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = EPLLeafCommonData2(endianness)
@@ -163,7 +163,7 @@ class EplPostEffectFillData(Serializable):
 class EplPostEffectLensFlareData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -183,7 +183,7 @@ class EplPostEffectLensFlareData(Serializable):
 class EplPostEffectColorCorrectionData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -207,7 +207,7 @@ class EplPostEffectColorCorrectionData(Serializable):
 class EplPostEffectMonotoneData(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -220,7 +220,7 @@ class EplPostEffectMonotoneData(Serializable):
 class EplPostEffectLensFlareMake(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -267,7 +267,7 @@ class EplPostEffectLensFlareMake(Serializable):
 class EplPostEffectMotionBlur(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
@@ -286,7 +286,7 @@ class EplPostEffectMotionBlur(Serializable):
 class EplPostEffectAfterImageBlur(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = EPLLeafCommonData2(endianness)
         self.unknown_0x04 = None
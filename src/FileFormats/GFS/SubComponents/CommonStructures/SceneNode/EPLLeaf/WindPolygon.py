@@ -6,7 +6,7 @@ from .Common import EPLEmbeddedFile, EPLLeafCommonData, EPLLeafCommonData2, Part
 class EPLLeafWindPolygon(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.type = None
         self.unknown_0x04 = None
@@ -78,7 +78,7 @@ class EPLLeafWindPolygon(Serializable):
 class EPLWindPolygonSpiral(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = EPLLeafCommonData(endianness)
@@ -108,7 +108,7 @@ class EPLWindPolygonSpiral(Serializable):
 class EPLWindPolygonExplosion(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         
@@ -132,7 +132,7 @@ class EPLWindPolygonExplosion(Serializable):
 class EplWindPolygonBall(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
 
         self.unknown_0x00 = EPLLeafCommonData(endianness)
         self.unknown_0x04 = EPLLeafCommonData(endianness)
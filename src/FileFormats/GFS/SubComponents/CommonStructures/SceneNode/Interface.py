@@ -50,24 +50,29 @@ class NodeInterface:
     
     @classmethod
     def _fetch_node_from_tree(cls, node, parent, node_list, mesh_list, camera_list, light_list, epl_list):
-        node_idx = len(node_list)
-        node_list.append(cls.from_binary(node, parent))
-        for attachment in node.attachments:
-            if attachment.type == 4:
-                mesh_list.append(MeshInterface.from_binary(node_idx, attachment.data))
-            elif attachment.type == 5:
-                camera_list.append(CameraInterface.from_binary(node_idx, attachment.data))
-            elif attachment.type == 6:
-                light_list.append(LightInterface.from_binary(node_idx, attachment.data))
-            elif attachment.type == 7:
-                epl_list.append(EPL.EPLInterface.from_binary(node_idx, attachment.data))
-            elif attachment.type == 9:
-                pass
-            #     morph_list.append(MorphInterface.from_binary(node_idx, attachment.data))
-            else:
-                raise NotImplementedError("No Interface exists for attachment type '{attachment.type}'")
-        for child in node.children[::-1]:
-            cls._fetch_node_from_tree(child, node_idx, node_list, mesh_list, camera_list, light_list, epl_list)
+        # Depth-first with an explicit stack, so that deep hierarchies can't
+        # exceed the recursion limit. Children are pushed in order so that
+        # they're popped, and therefore numbered, last-to-first.
+        stack = [(node, parent)]
+        while len(stack):
+            node, parent = stack.pop()
+            node_idx = len(node_list)
+            node_list.append(cls.from_binary(node, parent))
+            for attachment in node.attachments:
+                if attachment.type == 4:
+                    mesh_list.append(MeshInterface.from_binary(node_idx, attachment.data))
+                elif attachment.type == 5:
+                    camera_list.append(CameraInterface.from_binary(node_idx, attachment.data))
+                elif attachment.type == 6:
+                    light_list.append(LightInterface.from_binary(node_idx, attachment.data))
+                elif attachment.type == 7:
+                    epl_list.append(EPL.EPLInterface.from_binary(node_idx, attachment.data))
+                elif attachment.type == 9:
+                    pass
+                #     morph_list.append(MorphInterface.from_binary(node_idx, attachment.data))
+                else:
+                    raise NotImplementedError("No Interface exists for attachment type '{attachment.type}'")
+            stack.extend((child, node_idx) for child in node.children.data)
     
     @classmethod
     def list_to_binary_node_tree(cls, node_list, mesh_list, camera_list, light_list, epl_list):
@@ -119,11 +124,20 @@ class NodeInterface:
     
     @classmethod
     def _push_node_into_tree(cls, node_idx, node_children, node_collection, id_map):
-        child_node_idxs = node_children.get(node_idx, [])
-        for cn_id in child_node_idxs:
-            id_map[cn_id] = len(id_map)
-            node_collection[node_idx].children.insert(0, node_collection[cn_id])
-            cls._push_node_into_tree(cn_id, node_children, node_collection, id_map)
+        # Nodes are numbered in depth-first order, first child first, but
+        # are stored last child first: each child list is built in one go
+        # and reversed rather than inserting every child at the front.
+        stack = [(node_idx, False)]
+        while len(stack):
+            node_idx, is_child = stack.pop()
+            if is_child:
+                id_map[node_idx] = len(id_map)
+            child_node_idxs = node_children.get(node_idx)
+            if child_node_idxs is None:
+                continue
+            child_node_idxs = child_node_idxs[::-1]
+            node_collection[node_idx].children.extend([node_collection[cn_id] for cn_id in child_node_idxs])
+            stack.extend((cn_id, True) for cn_id in child_node_idxs)
 
     @classmethod
     def from_binary(cls, binary, parent_idx, bind_pose_matrix=None):
@@ -41,7 +41,7 @@ class LightFlags(BitVector0x20):
 class LightBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = LightFlags(endianness)
         self.type  = None
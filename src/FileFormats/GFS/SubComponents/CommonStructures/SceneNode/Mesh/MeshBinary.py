@@ -1,3 +1,7 @@
+import operator
+
+import numpy as np
+
 from .......serialization.Serializable import Serializable
 from .......serialization.utils import safe_format, hex32_format
 from ....CommonStructures import ObjectName, BitVector
@@ -77,7 +81,7 @@ class VertexFormat(BitVector):
 class MeshBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = MeshFlags(endianness)
         self.vertex_format = VertexFormat(endianness)
@@ -117,24 +121,8 @@ class MeshBinary(Serializable):
         if version > 0x01103020:
             self.unknown_0x12 = rw.rw_uint32(self.unknown_0x12)
         
-        rw_funcs = []
-        if self.vertex_format.has_positions:  rw_funcs.append(VertexAttributes.rw_position)
-        if self.vertex_format.has_normals:    rw_funcs.append(VertexAttributes.rw_normal)
-        if self.vertex_format.has_tangents:   rw_funcs.append(VertexAttributes.rw_tangent)
-        if self.vertex_format.has_binormals:  rw_funcs.append(VertexAttributes.rw_binormal)
-        if self.vertex_format.has_color1:     rw_funcs.append(VertexAttributes.rw_color1)
-        if self.vertex_format.has_texcoord_0: rw_funcs.append(VertexAttributes.rw_texcoord0)
-        if self.vertex_format.has_texcoord_1: rw_funcs.append(VertexAttributes.rw_texcoord1)
-        if self.vertex_format.has_texcoord_2: rw_funcs.append(VertexAttributes.rw_texcoord2)
-        if self.vertex_format.has_texcoord_3: rw_funcs.append(VertexAttributes.rw_texcoord3)
-        if self.vertex_format.has_texcoord_4: rw_funcs.append(VertexAttributes.rw_texcoord4)
-        if self.vertex_format.has_texcoord_5: rw_funcs.append(VertexAttributes.rw_texcoord5)
-        if self.vertex_format.has_texcoord_6: rw_funcs.append(VertexAttributes.rw_texcoord6)
-        if self.vertex_format.has_texcoord_7: rw_funcs.append(VertexAttributes.rw_texcoord7)
-        if self.vertex_format.has_color2:     rw_funcs.append(VertexAttributes.rw_color2)
-        if self.flags.has_weights:            rw_funcs.append(VertexAttributes.rw_weights)
-        
-        self.vertices = rw.rw_obj_array(self.vertices, VertexBinary, self.vertex_count, rw_funcs)
+        codec = VertexCodec.get(self.vertex_format, self.flags, self.context.endianness)
+        self.vertices = codec.rw_vertices(rw, self.vertices, self.vertex_count)
         
         # Do morphs
         if self.flags.has_morphs:
@@ -143,9 +131,9 @@ class MeshBinary(Serializable):
         # Do indices
         if self.flags.has_indices:
             if self.index_type == 1:
-                self.indices = rw.rw_uint16s(self.indices, self.tri_count*3)
+                self.indices = rw.rw_uint16_array(self.indices, self.tri_count*3)
             elif self.index_type == 2:
-                self.indices = rw.rw_uint32s(self.indices, self.tri_count*3)
+                self.indices = rw.rw_uint32_array(self.indices, self.tri_count*3)
             else:
                 raise NotImplementedError(f"Unknown Index Type '{self.index_type}'")
         
@@ -167,6 +155,47 @@ class MeshBinary(Serializable):
             self.unknown_float_1 = rw.rw_float32(self.unknown_float_1)
             self.unknown_float_2 = rw.rw_float32(self.unknown_float_2)
 
+    def size_of(self, version):
+        if self.vertices is None:
+            return None
+        
+        size = 8
+        if self.flags.has_indices:
+            size += 6
+        size += 4
+        if version > 0x01103020:
+            size += 4
+        
+        codec = VertexCodec.get(self.vertex_format, self.flags, self.context.endianness)
+        size += len(self.vertices)*codec.stride
+        
+        if self.flags.has_morphs:
+            size += self.morph_data.calc_size()
+        
+        if self.flags.has_indices:
+            if self.index_type == 1:
+                size += 2*self.tri_count*3
+            elif self.index_type == 2:
+                size += 4*self.tri_count*3
+            else:
+                return None
+        
+        if self.flags.has_material:
+            size += self.material_name.calc_size(version)
+        if self.flags.has_bounding_box:
+            size += 24
+        if self.flags.has_bounding_sphere:
+            size += 16
+        if self.flags.has_unknown_floats:
+            size += 8
+        return size
+
+    def get_positions(self):
+        if isinstance(self.vertices, VertexBuffer):
+            return self.vertices.get_column(VertexAttributes.POSITION).tolist()
+        else:
+            return [v.position for v in self.vertices]
+
     def calc_bounding_box(self):
         if not len(self.vertices):
             min_dims = [0, 0, 0]
@@ -175,11 +204,11 @@ class MeshBinary(Serializable):
             min_dims = [0, 0, 0]
             max_dims = [0, 0, 0]
         else:
-            max_dims = [*self.vertices[0].position]
-            min_dims = [*self.vertices[0].position]
+            positions = self.get_positions()
+            max_dims = [*positions[0]]
+            min_dims = [*positions[0]]
                     
-            for v in self.vertices:
-                pos = v.position
+            for pos in positions:
                 for i in range(3):
                     max_dims[i] = max(max_dims[i], pos[i])
                     min_dims[i] = min(min_dims[i], pos[i])
@@ -194,11 +223,11 @@ class MeshBinary(Serializable):
             center = [0, 0, 0]
             radius = 0
         else:
-            vs = [self.vertices[i] for i in self.indices]
-            center = [sum(v.position[i] for v in vs)/len(vs) for i in range(3)]
+            positions = self.get_positions()
+            vs = [positions[i] for i in self.indices]
+            center = [sum(pos[i] for pos in vs)/len(vs) for i in range(3)]
             radius = 0.
-            for v in self.vertices:
-                pos = v.position
+            for pos in positions:
                 dist = (p-c for p, c in zip(pos, center))
                 radius = max(sum(d*d for d in dist), radius)
             radius = radius**.5
@@ -281,12 +310,36 @@ class VertexBinary(Serializable):
     __slots__ = ("buffer",)
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.buffer = [None]*16
         
     def read_write(self, rw, funcs):
         for f in funcs:
             f(rw, self)
+    
+    FUNC_SIZES = {
+        VertexAttributes.rw_position:  12,
+        VertexAttributes.rw_normal:    12,
+        VertexAttributes.rw_tangent:   12,
+        VertexAttributes.rw_binormal:  12,
+        VertexAttributes.rw_color1:     4,
+        VertexAttributes.rw_color2:     4,
+        VertexAttributes.rw_weights:   20,
+        VertexAttributes.rw_texcoord0:  8,
+        VertexAttributes.rw_texcoord1:  8,
+        VertexAttributes.rw_texcoord2:  8,
+        VertexAttributes.rw_texcoord3:  8,
+        VertexAttributes.rw_texcoord4:  8,
+        VertexAttributes.rw_texcoord5:  8,
+        VertexAttributes.rw_texcoord6:  8,
+        VertexAttributes.rw_texcoord7:  8,
+    }
+    
+    def size_of(self, funcs):
+        sizes = self.FUNC_SIZES
+        if not all(f in sizes for f in funcs):
+            return None
+        return sum(sizes[f] for f in funcs)
             
     def __getitem__(self, idx):
         return self.buffer[idx]
@@ -406,10 +459,203 @@ class VertexBinary(Serializable):
     def texcoord7(self, value):
         self.buffer[VertexAttributes.TEXCOORD7] = value
 
+
+class VertexView(VertexBinary):
+    """
+    A single row of a VertexBuffer. Reads return plain lists copied out of
+    the underlying columns and writes go straight back into them, so it
+    can be used anywhere a VertexBinary is expected.
+    """
+    __slots__ = ("vertex_buffer", "row")
+    
+    def __init__(self, vertex_buffer, row):
+        # Deliberately skip Serializable.__init__: views don't need a Context
+        self.vertex_buffer = vertex_buffer
+        self.row = row
+        
+    @property
+    def buffer(self):
+        # VertexBinary's attribute properties index into self.buffer, which
+        # for a view resolves back to the column lookups below
+        return self
+        
+    def __getitem__(self, idx):
+        column = self.vertex_buffer.columns[idx]
+        if column is None:
+            return None
+        return column[self.row].tolist()
+    
+    def __setitem__(self, idx, value):
+        column = self.vertex_buffer.columns[idx]
+        if column is None:
+            raise ValueError(f"Vertex attribute {idx} is not present in this VertexBuffer; use VertexBuffer.set_column to add it")
+        column[self.row] = value
+
+
+class VertexBuffer:
+    """
+    Structure-of-arrays vertex storage holding one contiguous array per
+    attribute, indexed by VertexAttributes. Indexing or iterating yields
+    VertexView rows, so it can stand in for a list of VertexBinary.
+    Columns are held as float64/int64 so that values round-trip exactly as
+    they would through Python floats and ints.
+    """
+    __slots__ = ("columns", "count")
+    
+    column_types = (
+        np.float64, # POSITION
+        np.float64, # NORMAL
+        np.float64, # TANGENT
+        np.float64, # BINORMAL
+        np.int64,   # COLOR1
+        np.int64,   # COLOR2
+        np.float64, # WEIGHTS
+        np.int64,   # INDICES
+        np.float64, # TEXCOORD0
+        np.float64, # TEXCOORD1
+        np.float64, # TEXCOORD2
+        np.float64, # TEXCOORD3
+        np.float64, # TEXCOORD4
+        np.float64, # TEXCOORD5
+        np.float64, # TEXCOORD6
+        np.float64, # TEXCOORD7
+    )
+    
+    def __init__(self, count=0):
+        self.count   = count
+        self.columns = [None]*16
+        
+    def __repr__(self):
+        return f"[GFD::SceneContainer::SceneNode::Attachment::Mesh::VertexBuffer] {self.count}"
+        
+    def __len__(self):
+        return self.count
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [VertexView(self, i) for i in range(*idx.indices(self.count))]
+        idx = operator.index(idx)
+        if idx < 0:
+            idx += self.count
+        if not (0 <= idx < self.count):
+            raise IndexError(f"Vertex index {idx} out of range for a VertexBuffer of {self.count} vertices")
+        return VertexView(self, idx)
+    
+    def __iter__(self):
+        for i in range(self.count):
+            yield VertexView(self, i)
+            
+    def __deepcopy__(self, memo):
+        return self.copy()
+    
+    def copy(self):
+        out = VertexBuffer(self.count)
+        out.columns = [None if c is None else c.copy() for c in self.columns]
+        return out
+    
+    def get_column(self, attribute):
+        return self.columns[attribute]
+    
+    def set_column(self, attribute, values):
+        if values is None:
+            self.columns[attribute] = None
+            return
+        values = np.array(values, dtype=self.column_types[attribute])
+        if len(values) != self.count:
+            raise ValueError(f"Expected {self.count} values for vertex attribute {attribute}, received {len(values)}")
+        self.columns[attribute] = values
+
+
+class VertexCodec:
+    """
+    Compiles a VertexFormat and the MeshFlags weight bit into a single numpy
+    structured dtype, so that an entire vertex block is read or written in
+    one call instead of one VertexBinary.read_write per vertex.
+    Codecs are cached per (vertex format, has_weights, endianness).
+    """
+    __cache = {}
+    
+    # Attributes in on-disk order: (format check, name, buffer index, type, count, is_uv)
+    LAYOUT = (
+        (lambda vf, mf: vf.has_positions,  "position",  VertexAttributes.POSITION,  'f4', 3, False),
+        (lambda vf, mf: vf.has_normals,    "normal",    VertexAttributes.NORMAL,    'f4', 3, False),
+        (lambda vf, mf: vf.has_tangents,   "tangent",   VertexAttributes.TANGENT,   'f4', 3, False),
+        (lambda vf, mf: vf.has_binormals,  "binormal",  VertexAttributes.BINORMAL,  'f4', 3, False),
+        (lambda vf, mf: vf.has_color1,     "color1",    VertexAttributes.COLOR1,    'u1', 4, False),
+        (lambda vf, mf: vf.has_texcoord_0, "texcoord0", VertexAttributes.TEXCOORD0, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_1, "texcoord1", VertexAttributes.TEXCOORD1, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_2, "texcoord2", VertexAttributes.TEXCOORD2, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_3, "texcoord3", VertexAttributes.TEXCOORD3, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_4, "texcoord4", VertexAttributes.TEXCOORD4, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_5, "texcoord5", VertexAttributes.TEXCOORD5, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_6, "texcoord6", VertexAttributes.TEXCOORD6, 'f4', 2, True),
+        (lambda vf, mf: vf.has_texcoord_7, "texcoord7", VertexAttributes.TEXCOORD7, 'f4', 2, True),
+        (lambda vf, mf: vf.has_color2,     "color2",    VertexAttributes.COLOR2,    'u1', 4, False),
+        (lambda vf, mf: mf.has_weights,    "weights",   VertexAttributes.WEIGHTS,   'f4', 4, False),
+        (lambda vf, mf: mf.has_weights,    "indices",   VertexAttributes.INDICES,   'u1', 4, False),
+    )
+    
+    def __init__(self, attributes, endianness):
+        self.attributes = attributes
+        self.endianness = endianness
+        self.dtype = np.dtype([(name, endianness + typ, (count,)) for name, _, typ, count, _ in attributes])
+    
+    @classmethod
+    def get(cls, vertex_format, mesh_flags, endianness):
+        key = (vertex_format._value, mesh_flags.has_weights, endianness)
+        codec = cls.__cache.get(key)
+        if codec is None:
+            attributes = tuple(a[1:] for a in cls.LAYOUT if a[0](vertex_format, mesh_flags))
+            codec = cls(attributes, endianness)
+            cls.__cache[key] = codec
+        return codec
+    
+    @property
+    def stride(self):
+        return self.dtype.itemsize
+    
+    def rw_vertices(self, rw, vertices, vertex_count):
+        mode = rw.mode()
+        if mode == "read":
+            return self.decode(rw.rw_records(None, self.dtype, vertex_count))
+        elif mode == "write":
+            data = self.encode(vertices)
+            rw.rw_bytestring(data.tobytes(), data.nbytes)
+            return vertices
+        else:
+            rw.rw_bytestring(None, len(vertices)*self.stride)
+            return vertices
+    
+    def decode(self, data):
+        vertices = VertexBuffer(len(data))
+        for name, idx, _, _, is_uv in self.attributes:
+            column = data[name].astype(VertexBuffer.column_types[idx])
+            if is_uv:
+                column[:, 1] = (column[:, 1]*-1) + 1
+            vertices.columns[idx] = column
+        return vertices
+    
+    def encode(self, vertices):
+        data = np.empty(len(vertices), dtype=self.dtype)
+        for name, idx, typ, _, is_uv in self.attributes:
+            if isinstance(vertices, VertexBuffer):
+                column = vertices.columns[idx]
+                if column is None:
+                    raise ValueError(f"Vertex format requires '{name}', but the VertexBuffer has no such column")
+                if typ == 'u1' and len(column) and (column.min() < 0 or column.max() > 0xFF):
+                    raise ValueError(f"Vertex attribute '{name}' contains values that do not fit in a uint8")
+            else:
+                column = [v.buffer[idx] for v in vertices]
+            if is_uv:
+                column = np.array(column, dtype=np.float64).reshape(-1, 2)
+                column[:, 1] = (column[:, 1]*-1) + 1
+            data[name] = column
+        return data
+
 class MorphDataBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = 2
         self.count = 0
@@ -435,7 +681,7 @@ class MorphDataBinary(Serializable):
 class MorphTarget(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = 2
         self.count = 0
@@ -448,4 +694,4 @@ class MorphTarget(Serializable):
     def read_write(self, rw):
         self.flags = rw.rw_uint32(self.flags)
         self.count = rw.rw_uint32(self.count)
-        self.position_deltas = rw.rw_float32s(self.position_deltas, (self.count, 3))
+        self.position_deltas = rw.rw_float32_array(self.position_deltas, (self.count, 3))
@@ -10,7 +10,7 @@ from . import EPLLeaf
 class NodeAttachmentBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type = None
         self.data = None
@@ -1,4 +1,5 @@
 from ......serialization.Serializable import Serializable
+from ......serialization.Compiler import fixed_layout
 from ...CommonStructures import ObjectName, PropertyBinary
 from ...CommonStructures.SizedObjArrayModule import SizedObjArray
 from .NodeAttachmentBinary import NodeAttachmentBinary
@@ -7,7 +8,7 @@ from .NodeAttachmentBinary import NodeAttachmentBinary
 class SceneNodeBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.name = ObjectName()
         self.position = None
@@ -27,9 +28,7 @@ class SceneNodeBinary(Serializable):
         
     def read_write(self, rw, version):
         self.name        = rw.rw_obj(self.name, version)
-        self.position    = rw.rw_float32s(self.position, 3)
-        self.rotation    = rw.rw_float32s(self.rotation, 4)
-        self.scale       = rw.rw_float32s(self.scale, 3)
+        self.rw_transforms(rw)
         
         if version <= 0x01090000:
             self.unknown_byte = rw.rw_uint8(self.unknown_byte)
@@ -46,12 +45,26 @@ class SceneNodeBinary(Serializable):
         
         rw.rw_obj(self.children, version)
     
+    @fixed_layout
+    def rw_transforms(self, rw):
+        self.position    = rw.rw_float32s(self.position, 3)
+        self.rotation    = rw.rw_float32s(self.rotation, 4)
+        self.scale       = rw.rw_float32s(self.scale, 3)
+    
     @classmethod
     def walk_nodes(cls, node, operator):
-        operator.begin(node)
-        for child in node.children[::-1]:
-            cls.walk_nodes(child, operator)
-        operator.end()
+        # Iterative so that deep hierarchies can't exceed the recursion
+        # limit. A None entry marks the end of a node's subtree; children
+        # are pushed in order so they're visited last-to-first.
+        stack = [node]
+        while len(stack):
+            node = stack.pop()
+            if node is None:
+                operator.end()
+                continue
+            operator.begin(node)
+            stack.append(None)
+            stack.extend(node.children.data)
     
     @classmethod
     def fetch_attachment(cls, node, attachment_type):
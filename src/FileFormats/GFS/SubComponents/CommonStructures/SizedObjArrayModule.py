@@ -4,7 +4,7 @@ from .....serialization.Serializable import Serializable
 class SizedObjArray(Serializable):
     def __init__(self, member_type, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.__member_type = member_type
         self.count = 0
@@ -36,6 +36,12 @@ class SizedObjArray(Serializable):
         self.data.append(item)
         self.count += 1
         
+    def extend(self, items):
+        items = list(items)
+        assert all(type(item) == self.__member_type for item in items)
+        self.data.extend(items)
+        self.count += len(items)
+        
     def insert(self, idx, item):
         assert type(item) == self.__member_type
         self.data.insert(idx, item)
@@ -46,3 +52,6 @@ class SizedObjArray(Serializable):
         if rw.mode() != "read" and len(self.data):
             self.__member_type = type(self.data[0])
         self.data = rw.rw_obj_array(self.data, self.__member_type, self.count, version)
+
+    def size_of(self, version):
+        return 4 + sum(d.calc_size(version) for d in self.data)
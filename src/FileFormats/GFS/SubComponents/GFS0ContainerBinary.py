@@ -1,4 +1,5 @@
 from ....serialization.Serializable import Serializable
+from ....serialization.BinaryTargets import MmapReader
 from ....serialization.utils import safe_format, hex32_format
 from .Materials.Binary import MaterialPayload
 from .Model.Binary import ModelPayload
@@ -19,54 +20,127 @@ class GFS0ContainerBinary(Serializable):
     
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.version = None
         self.type = None
         self.size = None
         self.padding_0x0C = 0
         self.count = None
-        self.data = []
+        self.payload_offset = None
+        self._data = []
+        # Unparsed payload bytes of a lazily-read container
+        self._raw_payload = None
+        self._lazy_warnings = None
+        self._lazy_zero_copy = False
         
     def __repr__(self):
         return f"[GFS::Container] {safe_format(self.version, hex32_format)} {safe_format(self.type, hex32_format)} {self.size}"
 
+    @property
+    def data(self):
+        if self._raw_payload is not None:
+            self.parse_payload()
+        return self._data
+    
+    @data.setter
+    def data(self, value):
+        self._data = value
+        self._raw_payload = None
+    
+    @property
+    def is_parsed(self):
+        return self._raw_payload is None
+
+    @property
+    def raw_payload(self):
+        """
+        The unparsed payload bytes of a lazily-read container, or None if
+        the payload has been parsed.
+        """
+        return self._raw_payload
+
+    def get_payload_type(self):
+        if   self.type == 0x00010003: return ModelPayload
+        elif self.type == 0x000100F8: return Blob
+        elif self.type == 0x000100F9: return PhysicsPayload
+        elif self.type == 0x000100FB: return MaterialPayload
+        elif self.type == 0x000100FC: return TexturePayload
+        elif self.type == 0x000100FD: return AnimationPayload
+        else:
+            raise NotImplementedError(f"Unrecognised GFS Container Type: '{safe_format(self.type, hex32_format)}'")
+
+    def get_payload_args(self):
+        if self.type in [0x000100F8]: # Can be removed later
+            return [self.size - 0x10]
+        return []
+
+    def parse_payload(self):
+        """
+        Parses the payload bytes that were skipped over when the container
+        was read lazily.
+        """
+        raw_payload = self._raw_payload
+        data = self.get_payload_type()()
+        
+        rw = MmapReader(None)
+        rw.zero_copy = self._lazy_zero_copy
+        rw.init_buffer(raw_payload)
+        try:
+            rw.rw_obj(data, self.version, *self.get_payload_args())
+            if rw.tell() != len(raw_payload):
+                msg = f"Size of container {hex(self.type)} is {rw.tell() + 0x10}, expected {self.size}"
+                if self._lazy_warnings is None:
+                    raise ValueError(msg)
+                self._lazy_warnings.append(msg)
+        finally:
+            rw.destruct_buffer()
+        
+        self._data = data
+        self._raw_payload = None
+        self._lazy_warnings = None
+        self._lazy_zero_copy = False
+
+
+    def size_of(self):
+        if self.type == 0x00000001:
+            return 0x0C
+        elif self.type == 0x00000000:
+            return 0x10
+        elif self._raw_payload is not None:
+            return 0x10 + len(self._raw_payload)
+        elif self.type in [0x000100F8]: # Can be removed later
+            if self.size is None:
+                return None
+            args = [self.size - 0x10]
+        else:
+            args = []
+        return 0x10 + self.data.calc_size(self.version, *args)
 
-    def read_write(self, rw):
+    def read_write(self, rw, lazy=False, warnings=None, skip_payload=False):
+        start_offset = rw.tell()
         self.version      = rw.rw_uint32(self.version)
         self.type         = rw.rw_uint32(self.type)
-        self.size         = rw.rw_uint32(self.size)
+        size_offset = None
+        if self.size is None and rw.mode() != "read":
+            # Only payloads written through rw_obj can be measured as they
+            # are written; the others need their size up front
+            if self.type in [0x00000000, 0x00000001, 0x000100F8]:
+                raise ValueError(f"Container {safe_format(self.type, hex32_format)} must have its size set before it is written")
+            if rw.mode() == "write":
+                # Size wasn't precalculated: write a placeholder and patch it
+                # once the payload has been written
+                size_offset = rw.defer_uint32()
+        if size_offset is None:
+            self.size = rw.rw_uint32(self.size)
         
         # Need to be extremely careful here...
         # print(f"VERSION: {self.version:0>8x}, TYPE: {hex(self.type)}, SIZE: {self.size}")
         # if self.version < 0x01104030 and (rw.mode() == "read" or rw.mode() == "write"):
         #     raise UnsupportedVersionError(f"GFS file version '{safe_format(self.version, hex32_format)}' is not currently supported")
 
-        args = []
-        if self.type == 0x00000000:
-            pass
-        elif self.type == 0x00000001:
-            pass
-        elif self.type == 0x00010003: # Model
-            dtype = ModelPayload
-        elif self.type == 0x000100F8: # Unknown
-            dtype = Blob
-        elif self.type == 0x000100F9: # Physics
-            dtype = PhysicsPayload
-        elif self.type == 0x000100FB: # Materials
-            dtype = MaterialPayload
-        elif self.type == 0x000100FC: # Textures
-            dtype = TexturePayload
-        elif self.type == 0x000100FD: # Animations
-            dtype = AnimationPayload
-        else:
-            raise NotImplementedError(f"Unrecognised GFS Container Type: '{safe_format(self.type, hex32_format)}'")
-            
-
         if self.type == 0x00000001:
             return
-        elif self.type in [0x000100F8]: # Can be removed later
-            args = [self.size - 0x10]
         
         self.padding_0x0C = rw.rw_uint32(self.padding_0x0C)
         rw.assert_equal(self.padding_0x0C, 0) 
@@ -74,7 +148,33 @@ class GFS0ContainerBinary(Serializable):
         if self.type == 0x00000000:
             return
         
-        if rw.mode() == "read":
-            self.data = dtype()
-        assert type(self.data) == type(dtype()), f"{type(self.data)}, {type(dtype())}"
-        rw.rw_obj(self.data, self.version, *args) # Can remove *args when Blob can be removed
+        self.payload_offset = rw.tell()
+        if rw.mode() == "read" and skip_payload:
+            # Only the header is wanted: jump straight to the next container
+            if not self.size:
+                raise ValueError(f"Cannot skip the payload of container {hex(self.type)} because its size is unknown")
+            rw.seek(self.size - 0x10, 1)
+            self._data = None
+        elif rw.mode() == "read" and lazy and self.size:
+            # Skip over the payload using the size field, and only parse
+            # it when the data is first accessed
+            self._raw_payload    = rw.rw_buffer(None, self.size - 0x10)
+            self._lazy_warnings  = warnings
+            self._lazy_zero_copy = rw.zero_copy
+            self._data = None
+        elif self._raw_payload is not None:
+            # Never accessed since being read lazily: pass the bytes through
+            rw.rw_bytestring(self._raw_payload, len(self._raw_payload))
+        else:
+            # Only a payload that is actually parsed needs a known type, so
+            # headers of unrecognised containers can still be skipped over
+            dtype = self.get_payload_type()
+            args  = self.get_payload_args()
+            if rw.mode() == "read":
+                self.data = dtype()
+            assert type(self.data) == type(dtype()), f"{type(self.data)}, {type(dtype())}"
+            rw.rw_obj(self.data, self.version, *args) # Can remove *args when Blob can be removed
+        
+        if size_offset is not None:
+            self.size = rw.tell() - start_offset
+            rw.patch_uint32(size_offset, self.size)
@@ -59,7 +59,7 @@ class MaterialFlags(BitVector0x20):
 class MaterialBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.name         = ObjectName(endianness)
         self.flags        = MaterialFlags(endianness)
@@ -212,7 +212,7 @@ class MaterialAttributeFlags(BitVector0x10):
 class MaterialAttributeBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags = MaterialAttributeFlags(endianness)
         self.ID    = None
@@ -298,7 +298,7 @@ class ToonShadingPropertyFlags(MaterialAttributeSubTypeFlags):
 class ToonShadingProperty(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.colour = None
         self.light_threshold  = None
         self.light_factor     = None
@@ -368,7 +368,7 @@ class Property1Flags(MaterialAttributeSubTypeFlags):
 class Property1(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.unknown_0x00 = None
         self.unknown_0x04 = None
         self.unknown_0x08 = None
@@ -413,7 +413,7 @@ class Property1(Serializable):
 class OutlineProperty(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.type   = None
         self.colour = None
@@ -461,7 +461,7 @@ class Property3Flags(MaterialAttributeSubTypeFlags):
 class Property3(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.unknown_0x00 = None
         self.unknown_0x04 = None
         self.unknown_0x08 = None
@@ -530,7 +530,7 @@ class Property4Flags(MaterialAttributeSubTypeFlags):
 class Property4(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.unknown_0x00 = None
         self.unknown_0x04 = None
         self.unknown_0x08 = None
@@ -615,7 +615,7 @@ class Property5Flags(MaterialAttributeSubTypeFlags):
 class Property5(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.unknown_0x00 = None
         self.unknown_0x04 = None
         self.unknown_0x08 = None
@@ -651,7 +651,7 @@ class Property5(Serializable):
 class Property6(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         self.unknown_0x00 = None
         self.unknown_0x04 = None
         self.unknown_0x08 = None
@@ -665,7 +665,7 @@ class Property6(Serializable):
 class Property7(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
     def read_write(self, rw, version):
         pass
@@ -5,7 +5,7 @@ from ...CommonStructures import ObjectName
 class TextureSamplerBinary(Serializable):
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.name                  = ObjectName(endianness)
         self.unknown_0x04          = None
@@ -1,6 +1,7 @@
 from ......serialization.Serializable import Serializable
 from ......serialization.utils import safe_format, hex32_format
-from ....Utils.Matrices import transforms_to_matrix, multiply_transform_matrices, transform_vector
+from ....Utils.Matrices import transform_vector_batch
+from ....Utils.Skeleton import Skeleton
 from ...CommonStructures import BitVector, SceneNodeBinary
 from .SkinningDataBinary import SkinningDataBinary
 
@@ -59,7 +60,7 @@ class ModelPayload(Serializable):
     
     def __init__(self, endianness='>'):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.flags           = ModelFlags(endianness)
         self.skinning_data   = SkinningDataBinary(endianness)
@@ -86,31 +87,26 @@ class ModelPayload(Serializable):
             
         rw.rw_obj(self.root_node, version)
     
+    def get_skeleton(self, flat_nodes=None):
+        if flat_nodes is None:
+            flat_nodes = self.root_node.flattened()
+        return Skeleton.from_nodes(flat_nodes.nodes, flat_nodes.node_parents)
+    
     def get_mesh_bounding_boxes(self):
-        flat_nodes = self.root_node.flattened()
-        nodes        = flat_nodes.nodes
-        node_parents = flat_nodes.node_parents
-        
-        matrices = [None for _ in range(len(nodes))]
-        for i, bone in enumerate(nodes):
-            matrix = transforms_to_matrix(bone.position, bone.rotation, bone.scale)
-            parent_idx = node_parents[i]
-            if parent_idx > -1:
-                matrices[i] = multiply_transform_matrices(matrices[parent_idx], matrix)
-            else:
-                matrices[i] = matrix
+        skeleton = self.get_skeleton()
         
-        mesh_verts = []
+        mesh_node_indices = []
+        mesh_verts        = []
         for node_idx, mesh in self.root_node.get_meshes():
             if not mesh.flags.has_bounding_box:
                 continue
-            matrix   = matrices[node_idx]
-            min_dims = mesh.bounding_box_min_dims
-            max_dims = mesh.bounding_box_max_dims
-            
-            mesh_verts.append(transform_vector(matrix, min_dims))
-            mesh_verts.append(transform_vector(matrix, max_dims))
-        return mesh_verts, matrices
+            mesh_node_indices.extend((node_idx, node_idx))
+            mesh_verts.append(mesh.bounding_box_min_dims)
+            mesh_verts.append(mesh.bounding_box_max_dims)
+        
+        if len(mesh_verts):
+            mesh_verts = transform_vector_batch(skeleton.rest_pose_array()[mesh_node_indices], mesh_verts).tolist()
+        return mesh_verts, skeleton.rest_pose()
 
     def calc_bounding_box(self):
         mesh_verts, matrices = self.get_mesh_bounding_boxes()
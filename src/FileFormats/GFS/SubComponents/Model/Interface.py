@@ -1,22 +1,88 @@
 import copy
+import math
+
+import numpy as np
 
 from ...Utils.Matrices import multiply_transform_matrices, normalise_transform_matrix_scale
-from ...Utils.Matrices import transforms_to_matrix, transposed_mat4x4_to_mat4x3, mat4x3_to_transposed_mat4x4
+from ...Utils.Matrices import transposed_mat4x4_to_mat4x3, mat4x3_to_transposed_mat4x4
 from ...Utils.Matrices import are_transform_matrices_close, invert_transform_matrix
+from ...Utils.Matrices import slice_translation_from_transform
+from ...Utils.Skeleton import Skeleton
 
 from ..CommonStructures.SceneNode import NodeInterface
+from ..CommonStructures.SceneNode.Mesh.MeshBinary import VertexBuffer, VertexAttributes
 from .Binary import ModelPayload
 
 
-def build_rest_pose(bone, bones):
-    local_pose = transforms_to_matrix(bone.position, bone.rotation, bone.scale)
-    parent_idx = bone.parent_idx
-    
-    if parent_idx >= 0:
-        parent_pose = build_rest_pose(bones[parent_idx], bones)
-        return multiply_transform_matrices(parent_pose, local_pose)
+def get_skin_arrays(vertices):
+    """
+    Returns the (N, 4) bone indices and weights of a VertexBuffer or a list
+    of vertices as integer and float arrays.
+    """
+    if isinstance(vertices, VertexBuffer):
+        return vertices.get_column(VertexAttributes.INDICES), vertices.get_column(VertexAttributes.WEIGHTS)
+    indices = np.array([v.indices for v in vertices], dtype=np.int64)
+    weights = np.array([v.weights for v in vertices], dtype=np.float64)
+    return indices, weights
+
+
+def set_skin_indices(vertices, indices):
+    if isinstance(vertices, VertexBuffer):
+        vertices.set_column(VertexAttributes.INDICES, indices)
     else:
-        return local_pose
+        for v, row in zip(vertices, indices.tolist()):
+            v.indices = row
+
+
+class MatrixPaletteIndex:
+    """
+    Finds the first-added matrix that are_transform_matrices_close accepts
+    for a query matrix, without comparing against every matrix added so far.
+    
+    Matrices are bucketed by translation into cells twice as wide as the
+    translation tolerance. Any matrix that passes the translation test lies
+    in the query's cell or one of its 26 neighbours, so only those cells
+    need to be searched. Candidates are compared in the order they were
+    added, which gives the same result as a linear scan.
+    """
+    def __init__(self, rot_tol, trans_tol):
+        self.rot_tol   = rot_tol
+        self.trans_tol = trans_tol
+        self.cell_size = 2*trans_tol
+        self.matrices  = {}
+        self.cells     = {}
+    
+    def get_cell(self, matrix):
+        translation = slice_translation_from_transform(matrix)
+        # Non-finite translations never pass the tolerance test
+        if not all(math.isfinite(t) for t in translation):
+            return None
+        return tuple(math.floor(t / self.cell_size) for t in translation)
+    
+    def add(self, key, matrix):
+        self.matrices[key] = matrix
+        cell = self.get_cell(matrix)
+        if cell is not None:
+            if cell not in self.cells:
+                self.cells[cell] = []
+            self.cells[cell].append(key)
+    
+    def find(self, matrix):
+        cell = self.get_cell(matrix)
+        if cell is None:
+            return None
+        
+        x, y, z = cell
+        candidates = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    candidates.extend(self.cells.get((x+dx, y+dy, z+dz), ()))
+        
+        for key in sorted(candidates):
+            if all(are_transform_matrices_close(matrix, self.matrices[key], rot_tol=self.rot_tol, trans_tol=self.trans_tol)):
+                return key
+        return None
 
 
 class ModelInterface:
@@ -49,26 +115,30 @@ class ModelInterface:
                 if copy_verts:
                     mesh.vertices = copy.deepcopy(mesh.vertices)
                 if len(mesh.vertices) and mesh.vertices[0].indices is not None:
-                    # Remap indices from local indices to global indices
-                    palette_indices = set()
-                    for v in mesh.vertices:
-                        indices = [0, 0, 0, 0]
-                        for idx_idx, (idx, wgt) in enumerate(zip(v.indices[::-1], v.weights)):
-                            if wgt > 0:
-                                palette_indices.add(idx)
-                            if idx < len(binary.skinning_data.matrix_palette):
-                                indices[idx_idx] = binary.skinning_data.matrix_palette[idx]
-                            else:
-                                indices[idx_idx] = 0
-                                has_bad_vidxs = True
-                        v.indices = indices
+                    # Remap indices from local indices to global indices.
+                    # The indices are stored in the reverse order to the
+                    # weights, so flip them first
+                    local_indices, weights = get_skin_arrays(mesh.vertices)
+                    local_indices = local_indices[:, ::-1]
+                    palette_indices = np.unique(local_indices[weights > 0]).tolist()
+                    
+                    palette_lookup = np.array(binary.skinning_data.matrix_palette, dtype=np.int64).reshape(-1)
+                    in_palette = local_indices < len(palette_lookup)
+                    if not in_palette.all():
+                        has_bad_vidxs = True
+                    if len(palette_lookup):
+                        global_indices = np.where(in_palette, palette_lookup[np.where(in_palette, local_indices, 0)], 0)
+                    else:
+                        global_indices = np.zeros_like(local_indices)
+                    set_skin_indices(mesh.vertices, global_indices)
 
                     # Link IBPMs to the nodes they are relative to
-                    palette_indices = sorted(palette_indices)
                     node_idx = mesh.node
                     for palette_idx in palette_indices:
-                        weighted_node_idx = binary.skinning_data.matrix_palette[palette_idx]
-                        weighted_ibpm     = binary.skinning_data.ibpms[palette_idx]
+                        # Skinning data may be decoded as float32 arrays: promote to
+                        # Python floats so the bind pose is computed in double precision
+                        weighted_node_idx = int(binary.skinning_data.matrix_palette[palette_idx])
+                        weighted_ibpm     = [float(e) for e in binary.skinning_data.ibpms[palette_idx]]
                         bpm               = invert_transform_matrix(transposed_mat4x4_to_mat4x3(weighted_ibpm))
                         
                         if weighted_node_idx not in nodes_with_ibpms:
@@ -76,16 +146,9 @@ class ModelInterface:
                         nodes_with_ibpms[weighted_node_idx].append((node_idx, bpm))
 
         # Now construct bind poses for bones
-        world_pose_matrices = [None]*len(bones)
-        world_pose_matrices[0] = transforms_to_matrix(bones[0].position, bones[0].rotation, [1., 1., 1.])
-        world_rest_matrices = [None]*len(bones)
-        world_rest_matrices[0] = transforms_to_matrix(bones[0].position, bones[0].rotation, bones[0].scale)
-        for i, bone in enumerate(bones[1:]):
-            i = i+1
-            local_bpm = transforms_to_matrix(bone.position, bone.rotation, [1., 1., 1.])
-            world_pose_matrices[i] = multiply_transform_matrices(world_pose_matrices[bone.parent_idx], local_bpm)
-            local_rpm = transforms_to_matrix(bone.position, bone.rotation, bone.scale)
-            world_rest_matrices[i] = multiply_transform_matrices(world_rest_matrices[bone.parent_idx], local_rpm)
+        skeleton = Skeleton.from_bones(bones)
+        world_pose_matrices = skeleton.bind_pose()
+        world_rest_matrices = skeleton.rest_pose()
             
         for i, bone in enumerate(bones):
             if i in nodes_with_ibpms:
@@ -99,7 +162,7 @@ class ModelInterface:
                 n = len(contributing_matrices)
                 bone.bind_pose_matrix = [sum([m[comp_idx] for m in contributing_matrices])/n for comp_idx in range(12)]
             else:
-                bone.bind_pose_matrix = normalise_transform_matrix_scale(world_pose_matrices[i])
+                bone.bind_pose_matrix = normalise_transform_matrix_scale([e for e in world_pose_matrices[i]])
          
         if has_bad_vidxs and warnings is not None:
             warnings.append("Vertex indices were detected that overflow the bind pose matrix buffer. These have been remapped to the root node.")
@@ -126,9 +189,7 @@ class ModelInterface:
                 break
             
         # Create the world rest pose matrices
-        rest_pose_matrices = [None]*len(bones)
-        for i, bone in enumerate(bones):
-            rest_pose_matrices[i] = build_rest_pose(bone, bones)
+        rest_pose_matrices = Skeleton.from_bones(bones).rest_pose()
             
         if binary.flags.has_skin_data:
             ibpms = []
@@ -143,37 +204,28 @@ class ModelInterface:
                     # Track unweighted indices and weighted indices separately,
                     # because unweighted indices can be merged into a single
                     # index because they don't matter
-                    indices = set()
-                    local_unweighted_indices = set()
-                    for vertex in mesh_binary.vertices:
-                        for idx, wgt in zip(vertex.indices[::-1], vertex.weights[::-1]):
-                            if wgt == 0:
-                                local_unweighted_indices.add(idx)
-                            else:
-                                indices.add(idx)
+                    vertex_indices, vertex_weights = get_skin_arrays(mesh_binary.vertices)
+                    indices                  = np.unique(vertex_indices[vertex_weights != 0]).tolist()
+                    local_unweighted_indices = np.unique(vertex_indices[vertex_weights == 0]).tolist()
                     
                     # Deal with unweighted
-                    for idx in sorted(local_unweighted_indices):
+                    for idx in local_unweighted_indices:
                         index_lookup[(mesh_node_id, idx)] = 0
                     
                     # Deal with weighted
-                    for idx in sorted(indices):        
+                    for idx in indices:
                         index_matrix = bones[idx].bind_pose_matrix
                         ibpm = multiply_transform_matrices(invert_transform_matrix(index_matrix), node_matrix)
                         
                         if idx not in matrix_cache:
-                            matrix_cache[idx] = {}
+                            matrix_cache[idx] = MatrixPaletteIndex(rot_tol=0.001, trans_tol=0.01)
                         
-                        matching_matrix_found = False
-                        for palette_idx, palette_ibpm in matrix_cache[idx].items():
-                            if all(are_transform_matrices_close(ibpm, palette_ibpm, rot_tol=0.001, trans_tol=0.01)):
-                                index_lookup[(mesh_node_id, idx)] = palette_idx
-                                matching_matrix_found = True
-                                break
-                            
-                        if not matching_matrix_found:
+                        palette_idx = matrix_cache[idx].find(ibpm)
+                        if palette_idx is not None:
+                            index_lookup[(mesh_node_id, idx)] = palette_idx
+                        else:
                             palette_idx = len(matrix_palette)
-                            matrix_cache[idx][palette_idx] = ibpm
+                            matrix_cache[idx].add(palette_idx, ibpm)
                             matrix_palette.append(old_node_id_to_new_node_id_map[idx])
                             ibpms.append(ibpm)
                             index_lookup[(mesh_node_id, idx)] = palette_idx
@@ -182,19 +234,32 @@ class ModelInterface:
             binary.skinning_data.ibpms = [mat4x3_to_transposed_mat4x4(ibpm) for ibpm in ibpms]
             binary.skinning_data.bone_count = len(matrix_palette)
             
-            all_indices = set()
             # REMAP VERTEX INDICES
+            # Build a node index -> palette index table for each mesh node
+            palette_lookups = {}
+            for (mesh_node_id, idx), palette_idx in index_lookup.items():
+                if mesh_node_id not in palette_lookups:
+                    palette_lookups[mesh_node_id] = {}
+                palette_lookups[mesh_node_id][idx] = palette_idx
+            for mesh_node_id, lookup in palette_lookups.items():
+                table = np.full(max(lookup) + 1, -1, dtype=np.int64)
+                table[list(lookup.keys())] = list(lookup.values())
+                palette_lookups[mesh_node_id] = table
+            
             for mesh, mesh_node_id in mesh_binaries:
                 if copy_verts:
                     mesh.vertices = copy.deepcopy(mesh.vertices)
                 if len(mesh.vertices) and mesh.vertices[0].indices is not None:
-                    for v in mesh.vertices:
-                        indices = [index_lookup[(mesh_node_id, idx)] for idx in v.indices]
-                        all_indices.update(indices)
-                        for wgt_idx, wgt in enumerate(v.weights):
-                            if wgt == 0:
-                                indices[wgt_idx] = 0
-                        v.indices = indices[::-1]
+                    vertex_indices, vertex_weights = get_skin_arrays(mesh.vertices)
+                    table = palette_lookups.get(mesh_node_id, np.empty(0, dtype=np.int64))
+                    in_table = (vertex_indices >= 0) & (vertex_indices < len(table))
+                    indices = table[np.where(in_table, vertex_indices, 0)] if len(table) else np.full_like(vertex_indices, -1)
+                    unmapped = ~in_table | (indices < 0)
+                    if unmapped.any():
+                        bad_idx = int(vertex_indices[unmapped][0])
+                        raise KeyError((mesh_node_id, bad_idx))
+                    indices[vertex_weights == 0] = 0
+                    set_skin_indices(mesh.vertices, indices[:, ::-1])
         
         if keep_bounding_box:
             binary.flags.has_bounding_box = True
@@ -4,7 +4,7 @@ from ......serialization.Serializable import Serializable
 class PhysicsBoneLinkBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.mass = None
         self.unknown_0x04 = None
@@ -5,7 +5,7 @@ from ...CommonStructures import ObjectName
 class ColliderBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.collider_type = None
         self.capsule_radius = None
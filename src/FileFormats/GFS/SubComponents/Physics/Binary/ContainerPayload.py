@@ -25,7 +25,7 @@ class PhysicsPayload(Serializable):
     
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00       = None
         self.unknown_0x04       = None
@@ -6,7 +6,7 @@ from ...CommonStructures import ObjectName
 class PhysicsBoneBinary(Serializable):
     def __init__(self, endianness=">"):
         super().__init__()
-        self.context.endianness = endianness
+        self.context = self.context.with_endianness(endianness)
         
         self.unknown_0x00 = None
         self.unknown_0x04 = None
@@ -0,0 +1,148 @@
+import argparse
+import io
+import os
+import sys
+
+from ...serialization.BinaryTargets import Reader
+from ...serialization.utils import hex32_format
+from .Binary import NotAGFSFileError
+from .SubComponents.GFS0ContainerBinary import GFS0ContainerBinary
+
+
+GFS_EXTENSIONS = (".GFS", ".GMD", ".GAP")
+
+
+class ContainerEntry:
+    __slots__ = ("offset", "version", "type", "size", "payload_offset")
+
+    def __init__(self, offset, version, type, size, payload_offset):
+        self.offset         = offset
+        self.version        = version
+        self.type           = type
+        self.size           = size
+        self.payload_offset = payload_offset
+
+    def __repr__(self):
+        return f"[GFS::TOC::Container] {hex32_format(self.offset)} {hex32_format(self.type)} {self.type_name} {self.size}"
+
+    @property
+    def type_name(self):
+        if   self.type == 0x00000000: return "End"
+        elif self.type == 0x00000001: return "Start"
+        try:
+            ctr = GFS0ContainerBinary()
+            ctr.type = self.type
+            return ctr.get_payload_type().__name__
+        except NotImplementedError:
+            return "Unknown"
+
+
+class TableOfContents:
+    """
+    The container headers of a GFS file, read without decoding any of the
+    payloads.
+    """
+    def __init__(self, containers):
+        self.containers = containers
+
+    def __repr__(self):
+        return f"[GFS::TOC] {self.version if self.version is None else hex32_format(self.version)}, {len(self.containers)} containers"
+
+    def __iter__(self):
+        return iter(self.containers)
+
+    def __len__(self):
+        return len(self.containers)
+
+    @property
+    def version(self):
+        for ctr in self.containers:
+            if ctr.type == 0x00000001:
+                return ctr.version
+        return None
+
+    @property
+    def container_types(self):
+        return [ctr.type for ctr in self.containers]
+
+    def get_container(self, ctr_type):
+        for ctr in self.containers:
+            if ctr.type == ctr_type:
+                return ctr
+        return None
+
+    def has_container(self, ctr_type):
+        return self.get_container(ctr_type) is not None
+
+
+def scan_stream(rw, file_size):
+    """
+    Reads the GFS magic and every GFS0ContainerBinary header from a Reader,
+    seeking over the payloads using each container's size field.
+    """
+    rw.context = rw.context.with_endianness('>')
+    magic = rw.rw_bytestring(None, 4)
+    if magic != b'GFS0':
+        raise NotAGFSFileError(magic)
+
+    containers = []
+    while rw.tell() < file_size:
+        offset = rw.tell()
+        ctr = GFS0ContainerBinary()
+        rw.rw_obj(ctr, skip_payload=True)
+        containers.append(ContainerEntry(offset, ctr.version, ctr.type, ctr.size, ctr.payload_offset))
+    if rw.tell() > file_size:
+        raise ValueError(f"Container at offset {offset} extends {rw.tell() - file_size} bytes past the end of the file")
+    return TableOfContents(containers)
+
+
+def scan_file(filepath):
+    with Reader(filepath) as rw:
+        return scan_stream(rw, os.fstat(rw.bytestream.fileno()).st_size)
+
+
+def scan_bytes(bytestring):
+    rw = Reader(None)
+    rw.bytestream = io.BytesIO(bytestring)
+    return scan_stream(rw, len(bytestring))
+
+
+def find_gfs_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    if file.upper().endswith(GFS_EXTENSIONS):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the containers of GFS/GMD/GAP files without parsing their contents.")
+    parser.add_argument("paths", nargs="+", help="Files, or directories to search for GFS/GMD/GAP files")
+    parser.add_argument("--type", type=lambda x: int(x, 0), default=None, help="Only list files containing this container type, e.g. 0x000100FD")
+    args = parser.parse_args(argv)
+
+    n_errors = 0
+    for filepath in find_gfs_files(args.paths):
+        try:
+            toc = scan_file(filepath)
+        except Exception as e:
+            print(f"{filepath}: ERROR: {e}", file=sys.stderr)
+            n_errors += 1
+            continue
+
+        if args.type is not None and not toc.has_container(args.type):
+            continue
+
+        version = "?" if toc.version is None else hex32_format(toc.version)
+        print(f"{filepath}: version {version}")
+        for ctr in toc:
+            print(f"    {hex32_format(ctr.offset)}  {hex32_format(ctr.type)}  {ctr.type_name.ljust(16)}  {ctr.size}")
+    return 1 if n_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
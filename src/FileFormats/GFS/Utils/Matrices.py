@@ -1,66 +1,140 @@
-def transforms_to_matrix(loc, quat, scale):
-	# Quaternion
-	q_x = quat[0];
-	q_y = quat[1];
-	q_z = quat[2];
-	q_w = quat[3];
-
-	# Location
-	l_x = loc[0];
-	l_y = loc[1];
-	l_z = loc[2];
-
-	# Scale
-	s_x = scale[0];
-	s_y = scale[1];
-	s_z = scale[2];
-
-	out = [
-        0., 0., 0., 0.,
-        0., 0., 0., 0.,
-        0., 0., 0., 0.
-    ]
+import numpy as np
 
-	# Calculate total transform matrix
-	q_xx = q_x * q_x;
-	q_yy = q_y * q_y;
-	q_zz = q_z * q_z;
-
-	q_xy = q_x * q_y;
-	q_xz = q_x * q_z;
-	q_yz = q_y * q_z;
-	q_xw = q_x * q_w;
-	q_yw = q_y * q_w;
-	q_zw = q_z * q_w;
-
-	out[0] = 2 * s_x * (0.5 - q_yy - q_zz)
-	out[1] = 2 * s_y * (q_xy - q_zw)
-	out[2] = 2 * s_z * (q_xz + q_yw)
-	out[3] = l_x
-	out[4] = 2 * s_x * (q_xy + q_zw)
-	out[5] = 2 * s_y * (0.5 - q_xx - q_zz)
-	out[6] = 2 * s_z * (q_yz - q_xw)
-	out[7] = l_y
-	out[8] = 2 * s_x * (q_xz - q_yw)
-	out[9] = 2 * s_y * (q_yz + q_xw)
-	out[10] = 2 * s_z * (0.5 - q_xx - q_yy)
-	out[11] = l_z;
-
-	return out
 
-def multiply_transform_matrices(a, b):
-	out = [
-        0., 0., 0., 0.,
-        0., 0., 0., 0.,
-        0., 0., 0., 0.
-    ]
+###########################
+# Batched transform maths #
+###########################
+# Stacks of 4x3 transform matrices are (..., 3, 4) float64 arrays, where
+# the last two axes are the 12-element row-major lists used by the scalar
+# functions. Every element is computed with the same sequence of floating
+# point operations as the scalar code, so results are bit-identical.
+
+def transforms_to_matrix_batch(locs, quats, scales):
+    """
+    Builds an (N, 3, 4) stack of transform matrices from (N, 3) locations,
+    (N, 4) XYZW quaternions and (N, 3) scales.
+    """
+    locs   = np.asarray(locs,   dtype=np.float64)
+    quats  = np.asarray(quats,  dtype=np.float64)
+    scales = np.asarray(scales, dtype=np.float64)
+    
+    q_x = quats[..., 0]
+    q_y = quats[..., 1]
+    q_z = quats[..., 2]
+    q_w = quats[..., 3]
+    s_x = scales[..., 0]
+    s_y = scales[..., 1]
+    s_z = scales[..., 2]
+    
+    q_xx = q_x * q_x
+    q_yy = q_y * q_y
+    q_zz = q_z * q_z
+    
+    q_xy = q_x * q_y
+    q_xz = q_x * q_z
+    q_yz = q_y * q_z
+    q_xw = q_x * q_w
+    q_yw = q_y * q_w
+    q_zw = q_z * q_w
+    
+    out = np.empty((*np.broadcast_shapes(locs.shape[:-1], quats.shape[:-1], scales.shape[:-1]), 3, 4), dtype=np.float64)
+    out[..., 0, 0] = 2 * s_x * (0.5 - q_yy - q_zz)
+    out[..., 0, 1] = 2 * s_y * (q_xy - q_zw)
+    out[..., 0, 2] = 2 * s_z * (q_xz + q_yw)
+    out[..., 0, 3] = locs[..., 0]
+    out[..., 1, 0] = 2 * s_x * (q_xy + q_zw)
+    out[..., 1, 1] = 2 * s_y * (0.5 - q_xx - q_zz)
+    out[..., 1, 2] = 2 * s_z * (q_yz - q_xw)
+    out[..., 1, 3] = locs[..., 1]
+    out[..., 2, 0] = 2 * s_x * (q_xz - q_yw)
+    out[..., 2, 1] = 2 * s_y * (q_yz + q_xw)
+    out[..., 2, 2] = 2 * s_z * (0.5 - q_xx - q_yy)
+    out[..., 2, 3] = locs[..., 2]
+    return out
 
-	for i in range(0, 12, 4):
-		for j in range(4):
-			out[i + j] = a[i] * b[j] + a[i + 1] * b[4 + j] + a[i + 2] * b[8 + j]
-		out[i + 3] += a[i + 3]
 
-	return out
+def multiply_transform_matrices_batch(a, b):
+    """
+    Multiplies two broadcastable stacks of transform matrices, treating
+    each as a 4x4 matrix with an implicit (0, 0, 0, 1) final row.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    # Written out rather than using matmul so that the products are summed
+    # in the same order as the scalar version
+    out = a[..., :, 0:1] * b[..., None, 0, :] \
+        + a[..., :, 1:2] * b[..., None, 1, :] \
+        + a[..., :, 2:3] * b[..., None, 2, :]
+    out[..., 3] += a[..., 3]
+    return out
+
+
+def invert_transform_matrix_batch(matrices):
+    matrices = np.asarray(matrices, dtype=np.float64)
+    m1 = matrices[..., 0, 0]; m2 = matrices[..., 0, 1]; m3 = matrices[..., 0, 2]
+    m4 = matrices[..., 1, 0]; m5 = matrices[..., 1, 1]; m6 = matrices[..., 1, 2]
+    m7 = matrices[..., 2, 0]; m8 = matrices[..., 2, 1]; m9 = matrices[..., 2, 2]
+    determinant = m1*m5*m9 + m4*m8*m3 + m7*m2*m6 - m1*m6*m8 - m3*m5*m7 - m2*m4*m9
+    
+    out = np.empty(matrices.shape, dtype=np.float64)
+    out[..., 0, 0] = (m5*m9-m6*m8)/determinant
+    out[..., 0, 1] = (m3*m8-m2*m9)/determinant
+    out[..., 0, 2] = (m2*m6-m3*m5)/determinant
+    out[..., 1, 0] = (m6*m7-m4*m9)/determinant
+    out[..., 1, 1] = (m1*m9-m3*m7)/determinant
+    out[..., 1, 2] = (m3*m4-m1*m6)/determinant
+    out[..., 2, 0] = (m4*m8-m5*m7)/determinant
+    out[..., 2, 1] = (m2*m7-m1*m8)/determinant
+    out[..., 2, 2] = (m1*m5-m2*m4)/determinant
+    
+    t_x = matrices[..., 0, 3]
+    t_y = matrices[..., 1, 3]
+    t_z = matrices[..., 2, 3]
+    for i in range(3):
+        out[..., i, 3] = -(out[..., i, 0]*t_x + out[..., i, 1]*t_y + out[..., i, 2]*t_z)
+    return out
+
+
+def transform_vector_batch(matrices, vectors):
+    """
+    Transforms (..., 3) points by a broadcastable stack of transform
+    matrices.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    vectors  = np.asarray(vectors,  dtype=np.float64)
+    v_x = vectors[..., None, 0]
+    v_y = vectors[..., None, 1]
+    v_z = vectors[..., None, 2]
+    return matrices[..., 0]*v_x + matrices[..., 1]*v_y + matrices[..., 2]*v_z + matrices[..., 3]
+
+
+def mat4x3_to_transposed_mat4x4_batch(matrices):
+    """
+    Converts a stack of transform matrices to (N, 16) column-major 4x4
+    matrices.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    out = np.zeros((*matrices.shape[:-2], 4, 4), dtype=np.float64)
+    out[..., :3, :3] = np.swapaxes(matrices[..., :3], -1, -2)
+    out[..., 3, :3]  = matrices[..., 3]
+    out[..., 3, 3]   = 1.
+    return out.reshape((*matrices.shape[:-2], 16))
+
+
+def _matrix_to_list(matrix):
+    return matrix.reshape(-1).tolist()
+
+
+##########################
+# Scalar transform maths #
+##########################
+
+def transforms_to_matrix(loc, quat, scale):
+    return _matrix_to_list(transforms_to_matrix_batch(loc, quat, scale))
+
+
+def multiply_transform_matrices(a, b):
+    return _matrix_to_list(multiply_transform_matrices_batch(np.reshape(a, (3, 4)), np.reshape(b, (3, 4))))
 
 
 def normalise_rotation_matrix(a):
@@ -214,34 +288,7 @@ def transposed_mat4x4_to_mat4x3(ibpm):
     return out
 
 def mat4x3_to_transposed_mat4x4(bpm):
-    out = [
-        0., 0., 0., 0.,
-        0., 0., 0., 0.,
-        0., 0., 0., 0.,
-        0., 0., 0., 0.
-    ]
-    
-    # Rotation part
-    out[0]  = bpm[0]
-    out[1]  = bpm[4]
-    out[2]  = bpm[8]
-    out[3]  = 0.
-    out[4]  = bpm[1]
-    out[5]  = bpm[5]
-    out[6]  = bpm[9]
-    out[7]  = 0.
-    out[8]  = bpm[2]
-    out[9]  = bpm[6]
-    out[10] = bpm[10]
-    out[11] = 0.
-    
-    # Translation part
-    out[12] = bpm[3]
-    out[13] = bpm[7]
-    out[14] = bpm[11]
-    out[15] = 1.
-    
-    return out
+    return mat4x3_to_transposed_mat4x4_batch(np.reshape(bpm, (3, 4))).tolist()
 
 def invert_pos_rot_matrix(matrix):
     out = [
@@ -268,12 +315,6 @@ def invert_pos_rot_matrix(matrix):
     return out
 
 def invert_transform_matrix(matrix):
-    out = [
-        0., 0., 0., 0.,
-        0., 0., 0., 0.,
-        0., 0., 0., 0.
-    ]
-    
     # Pos x rot x scale matrices are block matrices:
     # | A B |
     # | C D |
@@ -283,31 +324,7 @@ def invert_transform_matrix(matrix):
     # Which evaluates to
     # | A^-1  -A^-1*B |
     # |  0       1    |
-    
-    # First let's invert A
-    Ainv = invert_3x3_matrix(
-        [
-            matrix[0], matrix[1], matrix[2],
-            matrix[4], matrix[5], matrix[6],
-            matrix[8], matrix[9], matrix[10]
-        ]
-    )
-    
-    # Now create the output matrix and calculate the second block
-    out[0]  = Ainv[0]
-    out[1]  = Ainv[1]
-    out[2]  = Ainv[2]
-    out[3]  = -(out[0]*matrix[3] + out[1]*matrix[7] + out[2]*matrix[11])
-    out[4]  = Ainv[3]
-    out[5]  = Ainv[4]
-    out[6]  = Ainv[5]
-    out[7]  = -(out[4]*matrix[3] + out[5]*matrix[7] + out[6]*matrix[11])
-    out[8]  = Ainv[6]
-    out[9]  = Ainv[7]
-    out[10] = Ainv[8]
-    out[11] = -(out[8]*matrix[3] + out[9]*matrix[7] + out[10]*matrix[11])
-    
-    return out
+    return _matrix_to_list(invert_transform_matrix_batch(np.reshape(matrix, (3, 4))))
 
 
 def slice_scale_from_matrix(matrix):
@@ -337,11 +354,4 @@ def normalise_transform_matrix_scale(matrix):
 
 
 def transform_vector(matrix_4x3, vector):
-    out = [0, 0, 0]
-    for i in range(3):
-        rx = matrix_4x3[4*i+0]
-        ry = matrix_4x3[4*i+1]
-        rz = matrix_4x3[4*i+2]
-        t  = matrix_4x3[4*i+3]
-        out[i] = rx*vector[0] + ry*vector[1] + rz*vector[2] + t
-    return out
+    return transform_vector_batch(np.reshape(matrix_4x3, (3, 4)), vector).tolist()
@@ -0,0 +1,202 @@
+import numpy as np
+
+from .Matrices import transforms_to_matrix_batch, multiply_transform_matrices_batch
+
+
+class Skeleton:
+    """
+    Computes the world matrices of a node hierarchy in one pass per depth
+    level, multiplying every node at a given depth by its parent's world
+    matrix in a single batched operation. The rest and bind poses are cached
+    on the instance; call invalidate() if the node transforms are edited.
+
+    The *_array methods return (N, 3, 4) arrays, as in the batched
+    Utils.Matrices functions; the others return lists of 12-element
+    row-major lists. The returned matrices are shared with the cache and
+    should be treated as read-only.
+    """
+    def __init__(self, parents, positions, rotations, scales):
+        self.parents   = list(parents)
+        self.positions = np.asarray(positions, dtype=np.float64).reshape((-1, 3))
+        self.rotations = np.asarray(rotations, dtype=np.float64).reshape((-1, 4))
+        self.scales    = np.asarray(scales,    dtype=np.float64).reshape((-1, 3))
+        self.order     = self.topological_order(self.parents)
+        self.levels    = self.depth_levels(self.parents, self.order)
+        self.is_root   = np.array([parent_idx < 0 for parent_idx in self.parents], dtype=bool)
+
+        self._local_rest_matrices = None
+        self._rest_pose           = None
+        self._bind_pose           = None
+        self._rest_pose_list      = None
+        self._bind_pose_list      = None
+
+    def __len__(self):
+        return len(self.parents)
+
+    @classmethod
+    def from_nodes(cls, nodes, parents):
+        return cls(parents,
+                   [node.position for node in nodes],
+                   [node.rotation for node in nodes],
+                   [node.scale    for node in nodes])
+
+    @classmethod
+    def from_bones(cls, bones):
+        return cls.from_nodes(bones, [bone.parent_idx for bone in bones])
+
+    @staticmethod
+    def topological_order(parents):
+        n_nodes = len(parents)
+        if all(parent_idx < i for i, parent_idx in enumerate(parents)):
+            return range(n_nodes)
+
+        children = [[] for _ in range(n_nodes)]
+        roots    = []
+        for i, parent_idx in enumerate(parents):
+            if parent_idx < 0:
+                roots.append(i)
+            elif parent_idx < n_nodes:
+                children[parent_idx].append(i)
+            else:
+                raise ValueError(f"Node {i} has parent {parent_idx}, but there are only {n_nodes} nodes")
+
+        order = []
+        stack = roots[::-1]
+        while len(stack):
+            node_idx = stack.pop()
+            order.append(node_idx)
+            stack.extend(children[node_idx][::-1])
+
+        if len(order) != n_nodes:
+            raise ValueError(f"Node hierarchy contains a cycle: only {len(order)} of {n_nodes} nodes are reachable from a root")
+        return order
+
+    @staticmethod
+    def depth_levels(parents, order):
+        """
+        Returns [(node indices, parent indices)] for every depth below the
+        roots, shallowest first.
+        """
+        depths = [0]*len(parents)
+        levels = []
+        for i in order:
+            parent_idx = parents[i]
+            if parent_idx < 0:
+                continue
+            depth = depths[parent_idx] + 1
+            depths[i] = depth
+            if depth > len(levels):
+                levels.append([])
+            levels[depth-1].append(i)
+        return [(np.array(level, dtype=np.intp), np.array([parents[i] for i in level], dtype=np.intp)) for level in levels]
+
+    def invalidate(self):
+        self._local_rest_matrices = None
+        self._rest_pose           = None
+        self._bind_pose           = None
+        self._rest_pose_list      = None
+        self._bind_pose_list      = None
+
+    ###############
+    # World Poses #
+    ###############
+
+    def world_matrices(self, local_matrices):
+        """
+        Converts (..., N, 3, 4) local matrices to world matrices. Any leading
+        axes, such as animation frames, are evaluated together.
+        """
+        world = np.array(local_matrices, dtype=np.float64)
+        for node_indices, parent_indices in self.levels:
+            world[..., node_indices, :, :] = multiply_transform_matrices_batch(world[..., parent_indices, :, :], world[..., node_indices, :, :])
+        return world
+
+    def local_rest_matrices(self):
+        if self._local_rest_matrices is None:
+            self._local_rest_matrices = transforms_to_matrix_batch(self.positions, self.rotations, self.scales)
+        return self._local_rest_matrices
+
+    def rest_pose_array(self):
+        """
+        World matrices of the nodes' own position, rotation and scale.
+        """
+        if self._rest_pose is None:
+            self._rest_pose = self.world_matrices(self.local_rest_matrices())
+        return self._rest_pose
+
+    def bind_pose_array(self):
+        """
+        World matrices of the nodes' position and rotation, ignoring scale.
+        """
+        if self._bind_pose is None:
+            local_matrices = transforms_to_matrix_batch(self.positions, self.rotations, np.ones_like(self.scales))
+            self._bind_pose = self.world_matrices(local_matrices)
+        return self._bind_pose
+
+    def rest_pose(self):
+        if self._rest_pose_list is None:
+            self._rest_pose_list = self.rest_pose_array().reshape((-1, 12)).tolist()
+        return self._rest_pose_list
+
+    def bind_pose(self):
+        if self._bind_pose_list is None:
+            self._bind_pose_list = self.bind_pose_array().reshape((-1, 12)).tolist()
+        return self._bind_pose_list
+
+    def pose_array(self, positions=None, rotations=None, scales=None):
+        """
+        World matrices with the transforms of some nodes replaced, given as
+        {node index: value} dicts. Only the overridden nodes and their
+        descendants are recomputed; everything else comes from the rest pose.
+        """
+        positions = {} if positions is None else positions
+        rotations = {} if rotations is None else rotations
+        scales    = {} if scales    is None else scales
+
+        overridden = sorted(set(positions) | set(rotations) | set(scales))
+        if not len(overridden):
+            return self.rest_pose_array().copy()
+
+        overridden_positions = self.positions[overridden]
+        overridden_rotations = self.rotations[overridden]
+        overridden_scales    = self.scales   [overridden]
+        for i, node_idx in enumerate(overridden):
+            if node_idx in positions: overridden_positions[i] = positions[node_idx]
+            if node_idx in rotations: overridden_rotations[i] = rotations[node_idx]
+            if node_idx in scales:    overridden_scales   [i] = scales   [node_idx]
+
+        local = self.local_rest_matrices().copy()
+        local[overridden] = transforms_to_matrix_batch(overridden_positions, overridden_rotations, overridden_scales)
+
+        world = self.rest_pose_array().copy()
+        dirty = np.zeros(len(self.parents), dtype=bool)
+        dirty[overridden] = True
+        world[dirty & self.is_root] = local[dirty & self.is_root]
+        for node_indices, parent_indices in self.levels:
+            level_dirty = dirty[node_indices] | dirty[parent_indices]
+            if not level_dirty.any():
+                continue
+            node_indices   = node_indices  [level_dirty]
+            parent_indices = parent_indices[level_dirty]
+            dirty[node_indices] = True
+            world[node_indices] = multiply_transform_matrices_batch(world[parent_indices], local[node_indices])
+        return world
+
+    def rest_transforms(self, n_poses):
+        """
+        Returns writeable (n_poses, N, 3), (n_poses, N, 4) and (n_poses, N, 3)
+        arrays of the nodes' positions, rotations and scales, to be filled
+        with animated values and passed to poses_array.
+        """
+        return (np.repeat(self.positions[None], n_poses, axis=0),
+                np.repeat(self.rotations[None], n_poses, axis=0),
+                np.repeat(self.scales   [None], n_poses, axis=0))
+
+    def poses_array(self, positions, rotations, scales):
+        """
+        World matrices of many poses at once, as an (n_poses, N, 3, 4) array.
+        """
+        return self.world_matrices(transforms_to_matrix_batch(positions, rotations, scales))
+
+    def pose(self, positions=None, rotations=None, scales=None):
+        return self.pose_array(positions, rotations, scales).reshape((-1, 12)).tolist()
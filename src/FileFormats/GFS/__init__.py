@@ -1,3 +1,4 @@
 from .Binary import GFSBinary, NotAGFSFileError
 from .Interface import GFSInterface
+from .ParseCache import ParseCache
 from .Interface import UnsupportedVersionError, ParticlesError
@@ -1,19 +1,157 @@
 import array
-import copy
+import functools
+import hashlib
+import mmap
+import os
+import re
 import struct
+import sys
+
+import numpy as np
 
 from .utils import chunk_list, flatten_list
 
 
 class Context:
-    __slots__ = ("endianness")
+    """
+    Immutable, interned settings shared by every object serialised with
+    them: Context(">") always returns the same instance. Objects switch
+    context by rebinding to a different instance, e.g. via
+    with_endianness, rather than by mutating the one they hold.
+    """
+    __slots__ = ("endianness",)
 
-    def __init__(self):
-        self.endianness = "<"
+    __interned = {}
+
+    def __new__(cls, endianness="<"):
+        try:
+            return cls.__interned[endianness]
+        except KeyError:
+            instance = super().__new__(cls)
+            object.__setattr__(instance, "endianness", endianness)
+            cls.__interned[endianness] = instance
+            return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Context objects are shared and immutable; use 'with_endianness' to get a different Context")
+
+    def __delattr__(self, name):
+        raise AttributeError("Context objects are shared and immutable")
+
+    def __repr__(self):
+        return f"Context('{self.endianness}')"
+
+    # Keep copies and pickles pointing at the interned instances
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Context, (self.endianness,))
+
+    def with_endianness(self, endianness):
+        return Context(endianness)
+
+
+@functools.lru_cache(maxsize=None)
+def _s3Quat_component_tables():
+    """
+    Decoded values of every possible 15-bit s3Quat component and their
+    squares. The squares are evaluated with Python's pow(), since NumPy's
+    square can differ from it in the last bit.
+    """
+    components = [((c - 16383) / 16384) / (2**.5) for c in range(32768)]
+    return np.array(components), np.array([c ** 2 for c in components])
+
+
+def _sum_like_python(a, b, c):
+    # Elementwise equivalent of the builtin sum([a, b, c]) for floats, which
+    # uses Neumaier's compensated summation from Python 3.12
+    if sys.version_info < (3, 12):
+        return (a + b) + c
+    total = a
+    compensation = np.zeros_like(a)
+    for x in (b, c):
+        t = total + x
+        compensation += np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+        total = t
+    return total + compensation
+
+
+def unpack_s3Quats(data):
+    """
+    Decodes an (N, 6) uint8 array of 'smallest three' quaternions into an
+    (N, 4) float64 array. Each quaternion stores three 15-bit components
+    mapped from [-1/sqrt(2), 1/sqrt(2)], followed by the 2-bit index of the
+    dropped largest component, which is reconstructed from normalisation.
+    Returns the quaternions, the number with a leading bit of 1, and the
+    number whose stored components are too long to be normalised; the
+    largest component of the latter is set to 0.
+    """
+    data = np.asarray(data, dtype=np.uint8).reshape(-1, 6).astype(np.int64)
+    n_bad_leading_bits = int(np.count_nonzero(data[:, 0] & 0x80))
+
+    packed_components = np.empty((len(data), 3), dtype=np.int64)
+    packed_components[:, 0] = (data[:, 0] & 0x7F) << 8 | data[:, 1]
+    packed_components[:, 1] = (data[:, 2] & 0xFF) << 7 | (data[:, 3] & 0xFE) >> 1
+    packed_components[:, 2] = (data[:, 3] & 0x01) << 14 | (data[:, 4] & 0xFF) << 6 | (data[:, 5] & 0xFC) >> 2
+    largest_index = data[:, 5] & 0x03
+
+    component_table, square_table = _s3Quat_component_tables()
+    components = component_table[packed_components]
+    squares    = square_table[packed_components]
+    square_vector_length = _sum_like_python(squares[:, 0], squares[:, 1], squares[:, 2])
+
+    # The square root is also taken with Python's pow() to match the
+    # scalar decoder bit-for-bit
+    bad_lengths = square_vector_length > 1
+    largest_component = np.zeros(len(data), dtype=np.float64)
+    largest_component[~bad_lengths] = [v**.5 for v in (1 - square_vector_length[~bad_lengths]).tolist()]
+
+    out = np.empty((len(data), 4), dtype=np.float64)
+    is_largest = np.arange(4)[None, :] == largest_index[:, None]
+    out[is_largest] = largest_component
+    out[~is_largest] = components.ravel()
+    return out, n_bad_leading_bits, int(np.count_nonzero(bad_lengths))
+
+
+def pack_s3Quats(quats):
+    """
+    Encodes an (N, 4) array of quaternions into an (N, 6) uint8 array of
+    'smallest three' quaternions; the inverse of unpack_s3Quats.
+    """
+    quats = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+    if not np.all(np.isfinite(quats)):
+        raise ValueError("Cannot pack a quaternion with non-finite components")
+
+    # Drop the largest component. Its sign isn't stored because
+    # (X, Y, Z, W) = (-X, -Y, -Z, -W), so multiply through by its sign to
+    # create an equivalent quaternion where it is always +ve
+    largest_index = np.argmax(np.abs(quats), axis=1)
+    is_largest = np.arange(4)[None, :] == largest_index[:, None]
+    largest_sign = np.where(quats[is_largest] < 0, -1., 1.)
+    components = quats[~is_largest].reshape(-1, 3) * largest_sign[:, None]
+
+    # No other component can be larger than 1/sqrt(2) due to normalisation
+    # So map the remaining components from the interval [-1/sqrt(2), 1/sqrt(2)] to [0, 32767] to gain ~1.4x precision
+    components = np.round(components * (2**.5) * 16384).astype(np.int64) + 16383
+    components = np.clip(components, 0, 32767)
+
+    # Now convert to big-endian uint15s
+    packed = np.empty((len(quats), 6), dtype=np.int64)
+    packed[:, 0] = (components[:, 0] >> 8) & 0x7F
+    packed[:, 1] = components[:, 0] & 0xFF
+    packed[:, 2] = (components[:, 1] >> 7) & 0xFF
+    packed[:, 3] = ((components[:, 1] & 0x7F) << 1) | ((components[:, 2] >> 14) & 0x01)
+    packed[:, 4] = (components[:, 2] >> 6) & 0xFF
+    packed[:, 5] = ((components[:, 2] & 0x3F) << 2) | largest_index
+    return packed.astype(np.uint8)
 
 
 class BinaryTargetBase:
-    __slots__ = ("filename", "endianness", "bytestream", "anchor_pos", "context")
+    __slots__ = ("filename", "endianness", "bytestream", "anchor_pos", "context", "structs", "strings", "use_compiled", "zero_copy", "profiler")
 
     open_flags = None
 
@@ -36,6 +174,24 @@ class BinaryTargetBase:
         'd': 8  # double
     }
 
+    # Sized numpy equivalents of the struct typecodes; 'l' and 'L' are
+    # platform-dependent in numpy so everything is spelled out explicitly
+    numpy_types = {
+        'b': 'i1',
+        'B': 'u1',
+        'h': 'i2',
+        'H': 'u2',
+        'i': 'i4',
+        'I': 'u4',
+        'l': 'i4',
+        'L': 'u4',
+        'q': 'i8',
+        'Q': 'u8',
+        'e': 'f2',
+        'f': 'f4',
+        'd': 'f8'
+    }
+
     ############################
     # Main Behaviour Functions #
     ############################
@@ -45,6 +201,15 @@ class BinaryTargetBase:
         self.bytestream = None
         self.anchor_pos = 0
         self.context = Context()
+        self.structs = {}
+        self.strings = {}
+        # Whether methods marked with Compiler.fixed_layout may be replaced
+        # by their generated equivalents
+        self.use_compiled = False
+        # Whether rw_buffer may return views into the source buffer
+        self.zero_copy = False
+        # Profiler.Profiler recording rw_obj calls, if one is attached
+        self.profiler = None
 
     # Context managers are a decent approximation of RAII behaviour
     def __enter__(self):
@@ -65,8 +230,27 @@ class BinaryTargetBase:
     def rw_multiple(self, typecode, value, shape, endianness=None):
         return self._rw_multiple(typecode, self.type_sizes[typecode], value, shape, endianness)
 
+    def get_struct(self, endianness, typecode, count=1):
+        # Cache is nested as {endianness: {typecode or (typecode, count): Struct}}
+        # so that the hot scalar path doesn't have to build a key tuple
+        key = typecode if count == 1 else (typecode, count)
+        try:
+            return self.structs[endianness][key]
+        except KeyError:
+            packer = struct.Struct(f"{endianness}{count}{typecode}")
+            self.structs.setdefault(endianness, {})[key] = packer
+            return packer
+
+    def get_dtype(self, endianness, typecode):
+        return np.dtype(endianness + self.numpy_types[typecode])
+
     def rw_obj(self, obj, *args, **kwargs):
+        # Contexts are interned, so an identity check is enough to skip the
+        # swap when the object shares the current settings
         previous_context = self.context
+        if obj.context is previous_context:
+            obj.read_write(self, *args, **kwargs)
+            return obj
         self.context = obj.context
         obj.read_write(self, *args, **kwargs)
         self.context = previous_context
@@ -74,6 +258,9 @@ class BinaryTargetBase:
 
     def rw_obj_method(self, obj, method, *args, **kwargs):
         previous_context = self.context
+        if obj.context is previous_context:
+            method(self, *args, **kwargs)
+            return
         self.context = obj.context
         method(self, *args, **kwargs)
         self.context = previous_context
@@ -121,6 +308,20 @@ class BinaryTargetBase:
     def rw_float32s(self, value, shape, endianness=None): return self._rw_multiple('f', 4, value, shape, endianness)
     def rw_float64s(self, value, shape, endianness=None): return self._rw_multiple('d', 8, value, shape, endianness)
 
+    # Array mode: reads return numpy arrays of the given shape rather than
+    # nested lists, writes accept ndarrays or anything np.asarray can take
+    def rw_int8_array   (self, value, shape, endianness=None): return self._rw_array('b', 1, value, shape, endianness)
+    def rw_uint8_array  (self, value, shape, endianness=None): return self._rw_array('B', 1, value, shape, endianness)
+    def rw_int16_array  (self, value, shape, endianness=None): return self._rw_array('h', 2, value, shape, endianness)
+    def rw_uint16_array (self, value, shape, endianness=None): return self._rw_array('H', 2, value, shape, endianness)
+    def rw_int32_array  (self, value, shape, endianness=None): return self._rw_array('i', 4, value, shape, endianness)
+    def rw_uint32_array (self, value, shape, endianness=None): return self._rw_array('I', 4, value, shape, endianness)
+    def rw_int64_array  (self, value, shape, endianness=None): return self._rw_array('q', 8, value, shape, endianness)
+    def rw_uint64_array (self, value, shape, endianness=None): return self._rw_array('Q', 8, value, shape, endianness)
+    def rw_float16_array(self, value, shape, endianness=None): return self._rw_array('e', 2, value, shape, endianness)
+    def rw_float32_array(self, value, shape, endianness=None): return self._rw_array('f', 4, value, shape, endianness)
+    def rw_float64_array(self, value, shape, endianness=None): return self._rw_array('d', 8, value, shape, endianness)
+
     ####################################
     # Bytestream Interaction Functions #
     ####################################
@@ -204,12 +405,31 @@ class BinaryTargetBase:
     def rw_offset_uint32(self, value, offset, endianness=None):
         raise NotImplementedError
 
+    def defer_uint32(self, endianness=None):
+        raise NotImplementedError
+
+    def patch_uint32(self, offset, value, endianness=None):
+        raise NotImplementedError
+
     def _rw_single(self, typecode, size, value, endianness=None):
         raise NotImplementedError
 
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
         raise NotImplementedError
 
+    def _rw_array(self, typecode, size, value, shape, endianness=None):
+        raise NotImplementedError
+
+    def rw_records(self, value, dtype, count):
+        """
+        Reads or writes 'count' elements of a (possibly structured) NumPy
+        dtype, whose byte order is part of the dtype.
+        """
+        raise NotImplementedError
+
+    def rw_struct(self, packer, values):
+        raise NotImplementedError
+
     def rw_str(self, value, length, encoding='ascii'):
         raise NotImplementedError
 
@@ -225,6 +445,15 @@ class BinaryTargetBase:
     def rw_bytestrings(self, value, count, shape):
         raise NotImplementedError
 
+    def rw_buffer(self, value, count):
+        """
+        Like rw_bytestring, but for large blobs that are usually passed
+        through untouched. Readers backed by an in-memory buffer return a
+        read-only memoryview into it instead of a copy when zero_copy is
+        set, so anything that wants to modify the data must copy it first.
+        """
+        return self.rw_bytestring(value, count)
+
     def rw_unbounded_bytestring(self, value):
         raise NotImplementedError
 
@@ -267,10 +496,17 @@ class Reader(BinaryTargetBase):
     def rw_offset_uint32(self, value, offset, endianness=None):
         return self.rw_uint32(value, endianness) + offset
     
+    def _unpack(self, packer):
+        return packer.unpack(self.bytestream.read(packer.size))
+
     def _rw_single(self, typecode, size, value, endianness=None):
         if endianness is None:
             endianness = self.context.endianness
-        return struct.unpack(endianness + typecode, self.bytestream.read(size))[0]
+        try:
+            packer = self.structs[endianness][typecode]
+        except KeyError:
+            packer = self.get_struct(endianness, typecode)
+        return packer.unpack(self.bytestream.read(size))[0]
 
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
         if endianness is None:
@@ -287,7 +523,7 @@ class Reader(BinaryTargetBase):
         else:
             arr_typecode = typecode
         data = array.array(arr_typecode,
-                           struct.unpack(endianness + typecode * n_to_read, self.bytestream.read(size * n_to_read)))
+                           self._unpack(self.get_struct(endianness, typecode, n_to_read)))
         # Group the lists up
         # Skip the outer index because we don't need it (we'll automatically
         # get an end result of that length) and create groups by iterating
@@ -296,21 +532,72 @@ class Reader(BinaryTargetBase):
             data = chunk_list(data, subshape)
         return data
 
+    def _rw_array(self, typecode, size, value, shape, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        n_to_read = 1
+        for elem in shape:
+            n_to_read *= elem
+
+        # Copy into a bytearray so the result is writeable and doesn't keep
+        # the source buffer alive
+        data = bytearray(self._read_array_bytes(size * n_to_read))
+        if len(data) != size * n_to_read:
+            raise ValueError(f"Expected to read {size * n_to_read} bytes for an array, but only {len(data)} remain")
+        return np.frombuffer(data, dtype=self.get_dtype(endianness, typecode)).reshape(shape)
+
+    def _read_array_bytes(self, count):
+        return self.bytestream.read(count)
+
+    def rw_records(self, value, dtype, count):
+        data = bytearray(self._read_array_bytes(dtype.itemsize * count))
+        if len(data) != dtype.itemsize * count:
+            raise ValueError(f"Expected to read {dtype.itemsize * count} bytes for an array, but only {len(data)} remain")
+        return np.frombuffer(data, dtype=dtype)
+
+    def rw_struct(self, packer, values):
+        return self._unpack(packer)
+
+    def decode_str(self, data, encoding):
+        # Names repeat throughout a file (bones in the node tree, skinning
+        # data and animation controllers, materials on every mesh...) so
+        # decoded strings are cached and interned per encoding
+        try:
+            return self.strings[encoding][data]
+        except KeyError:
+            out = sys.intern(data.decode(encoding))
+            self.strings.setdefault(encoding, {})[data] = out
+            return out
+
     def rw_str(self, value, length, encoding='ascii'):
         data = self.bytestream.read(length)
         try:
-            return data.decode(encoding)
+            return self.decode_str(data, encoding)
         except Exception as e:
             print(data)
             raise e
 
-    def rw_cstr(self, value, encoding='ascii', end_char=b"\x00"):
-        out = b""
-        val = self.bytestream.read(1)
-        while (val != end_char and val != b''):
-            out += val
-            val = self.bytestream.read(1)
-        return out.decode(encoding)
+    def rw_cstr(self, value, encoding='ascii', end_char=b"\x00", block_size=64):
+        # Scan ahead a block at a time for the terminator, then seek back to
+        # just past it, rather than reading one byte per call
+        start = self.bytestream.tell()
+        data = bytearray()
+        search_from = 0
+        while True:
+            block = self.bytestream.read(block_size)
+            data += block
+            end = data.find(end_char, search_from)
+            if end != -1:
+                self.bytestream.seek(start + end + len(end_char))
+                break
+            elif not block:
+                end = len(data)
+                break
+            search_from = max(len(data) - len(end_char) + 1, 0)
+        return self.decode_str(bytes(data[:end]), encoding)
         
     def rw_uint16_sized_str(self, value, encoding="ascii"):
         size = self.rw_uint16(None)
@@ -329,30 +616,7 @@ class Reader(BinaryTargetBase):
         return self.bytestream.read()
 
     def rw_s3Quat(self, value, endianness=None):
-        input_data = self.rw_uint8s(None, 6)
-        if (input_data[0] & 0x80) >> 7 == 1:
-            print("WARNING: Quaternion with a leading bit of 1 found.")
-        c1 = (input_data[0] & 0x7F) << 8 | input_data[1]
-        c2 = (input_data[2] & 0xFF) << 7 | (input_data[3] & 0xFE) >> 1
-        c3 = (input_data[3] & 0x01) << 14 | (input_data[4] & 0xFF) << 6 | (input_data[5] & 0xFC) >> 2
-        largest_index = input_data[5] & 0x03
-
-        components = [c1, c2, c3]
-        components = [c - 16383 for c in components]
-        components = [c / 16384 for c in components]
-        components = [c / (2**.5) for c in components]
-
-        square_vector_length = sum([c ** 2 for c in components])
-        largest_component = (1 - square_vector_length)**.5
-        if square_vector_length <= 1: # Should be smaller than 0.5...
-            largest_component = (1 - square_vector_length)**.5
-        else:
-            print("WARNING: Quaternion with an invalid largest component found.")
-            largest_component = 0
-
-        components.insert(largest_index, largest_component)
-
-        return components
+        return self.rw_s3Quats(None, 1, endianness)[0]
 
     def rw_s3Quats(self, value, shape, endianness=None):
         if not hasattr(shape, "__getitem__"):
@@ -361,8 +625,13 @@ class Reader(BinaryTargetBase):
         for elem in shape:
             n_to_read *= elem
 
-        data = [self.rw_s3Quat(None, endianness) for _ in range(n_to_read)]
+        quats, n_bad_leading_bits, n_bad_lengths = unpack_s3Quats(self.rw_uint8_array(None, (n_to_read, 6)))
+        if n_bad_leading_bits:
+            print(f"WARNING: {n_bad_leading_bits} quaternion(s) with a leading bit of 1 found.")
+        if n_bad_lengths:
+            print(f"WARNING: {n_bad_lengths} quaternion(s) with an invalid largest component found.")
 
+        data = quats.tolist()
         for subshape in shape[1::][::-1]:
             data = chunk_list(data, subshape)
         return data
@@ -383,13 +652,17 @@ class Reader(BinaryTargetBase):
         for elem in shape:
             n_to_read *= elem
 
+        context = self.context
         data = []
         for _ in range(n_to_read):
             d = obj_constructor()
             data.append(d)
             if validator is not None:
                 validator(d)
-            self.rw_obj(d, *args, **kwargs)
+            if d.context is context:
+                d.read_write(self, *args, **kwargs)
+            else:
+                self.rw_obj(d, *args, **kwargs)
     
         for subshape in shape[1::][::-1]:
             data = chunk_list(data, subshape)
@@ -420,6 +693,374 @@ class Reader(BinaryTargetBase):
         return "read"
 
 
+class MmapReader(Reader):
+    """
+    A Reader that maps the whole file into memory once and decodes data
+    directly from a memoryview, tracking the file position with an integer
+    cursor instead of issuing a read call on a file object for every
+    primitive. Can also be pointed at an in-memory buffer with
+    'init_buffer'.
+    """
+    __slots__ = ("source", "buffer", "cursor", "_mmap")
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.source = None
+        self.buffer = None
+        self.cursor = 0
+        self._mmap  = None
+
+    def __enter__(self):
+        self.bytestream = open(self.filename, self.open_flags)
+        # Zero-length files cannot be mapped
+        if os.fstat(self.bytestream.fileno()).st_size:
+            self._mmap = mmap.mmap(self.bytestream.fileno(), 0, access=mmap.ACCESS_READ)
+            self.init_buffer(self._mmap)
+        else:
+            self.init_buffer(b'')
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback):
+        self.destruct_buffer()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Zero-copy views into the map are still alive. The map
+                # stays valid until the last of them is released, and is
+                # unmapped when it is garbage collected
+                pass
+            self._mmap = None
+        self.bytestream.close()
+        self.bytestream = None
+
+    def init_buffer(self, buffer):
+        self.source = buffer
+        self.buffer = memoryview(buffer)
+        self.cursor = 0
+
+    def destruct_buffer(self):
+        self.buffer.release()
+        self.buffer = None
+        self.source = None
+
+    def _read(self, count=None):
+        start = self.cursor
+        if count is None:
+            end = len(self.buffer)
+        else:
+            end = min(start + count, len(self.buffer))
+        self.cursor = end
+        return self.buffer[start:end]
+
+    ####################################
+    # Bytestream Interaction Functions #
+    ####################################
+
+    def tell(self):
+        return self.cursor
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.cursor = offset
+        elif whence == 1:
+            self.cursor += offset
+        elif whence == 2:
+            self.cursor = len(self.buffer) + offset
+        else:
+            raise ValueError(f"Invalid whence value '{whence}'")
+
+    def peek_bytestring(self, count):
+        return self.buffer[self.cursor:self.cursor + count].tobytes()
+
+    def assert_at_eof(self):
+        if self.cursor < len(self.buffer):
+            raise Exception("Not at end of file!")
+
+    ################
+    # RW Functions #
+    ################
+
+    def _handle_pads(self, count):
+        value = self._read(count)
+        if value != b'\x00'*count:
+            raise ValueError(f"Excepted padding bytes, but found {value.tobytes()}")
+
+    def _read_array_bytes(self, count):
+        return self._read(count)
+
+    def _unpack(self, packer):
+        data = packer.unpack_from(self.buffer, self.cursor)
+        self.cursor += packer.size
+        return data
+
+    def _rw_single(self, typecode, size, value, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+        try:
+            packer = self.structs[endianness][typecode]
+        except KeyError:
+            packer = self.get_struct(endianness, typecode)
+        value = packer.unpack_from(self.buffer, self.cursor)[0]
+        self.cursor += size
+        return value
+
+    def rw_str(self, value, length, encoding='ascii'):
+        data = self._read(length).tobytes()
+        try:
+            return self.decode_str(data, encoding)
+        except Exception as e:
+            print(data)
+            raise e
+
+    def _find(self, sub, start, block_size=64):
+        """
+        Returns the offset of the first occurrence of 'sub' at or after
+        'start', or -1. Searches the source directly when it supports it;
+        memoryviews, such as zero-copy container payloads, are scanned a
+        block at a time instead.
+        """
+        if hasattr(self.source, "find"):
+            return self.source.find(sub, start)
+        
+        buffer = self.buffer
+        overlap = len(sub) - 1
+        while start < len(buffer):
+            idx = buffer[start:start + block_size + overlap].tobytes().find(sub)
+            if idx != -1:
+                return start + idx
+            start += block_size
+        return -1
+
+    def rw_cstr(self, value, encoding='ascii', end_char=b"\x00"):
+        end = self._find(end_char, self.cursor)
+        if end == -1:
+            end = len(self.buffer)
+        out = self.buffer[self.cursor:end].tobytes()
+        self.cursor = min(end + len(end_char), len(self.buffer))
+        return self.decode_str(out, encoding)
+
+    def rw_bytestring(self, value, count):
+        return self._read(count).tobytes()
+
+    def rw_buffer(self, value, count):
+        if not self.zero_copy:
+            return self.rw_bytestring(value, count)
+        view = self._read(count)
+        if len(view) != count:
+            raise ValueError(f"Expected to read {count} bytes, but only {len(view)} remain")
+        return view
+
+    def rw_unbounded_bytestring(self, value):
+        return self._read().tobytes()
+
+    def align(self, offset, alignment, padval=b'\x00'):
+        n_to_read = (alignment - (offset % alignment)) % alignment
+        data = self._read(n_to_read).tobytes()
+        expected = padval * (len(data) // len(padval))
+        assert data == expected, f"Unexpected padding: Expected {expected}, read {data}."
+
+
+class Transcoder(MmapReader):
+    """
+    Converts a buffer between big- and little-endian by walking it like a
+    Reader and byte-swapping every typed value in place. Strings, raw
+    bytestrings, padding and single-byte values are left untouched, and
+    arrays, vertex records and compiled struct runs are swapped in bulk.
+
+    The endianness declared by the objects being read describes one side
+    of the conversion. If 'swapped_source' is False the source is in the
+    declared endianness and the result is in the opposite one; if it is
+    True, the source is in the opposite endianness and the result is in
+    the declared one.
+    """
+    __slots__ = ("swap_first", "swap_enabled")
+
+    # Pairs of Structs that reinterpret a run of values as unsigned integers
+    # of the same size in one byte order and pack them back in the other
+    _swappers = {}
+    _UNSIGNED_TYPES = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+    def __init__(self, buffer, swapped_source=False):
+        super().__init__(None)
+        self.swap_first = swapped_source
+        # Turned off while reading the elements of an array that has
+        # already been swapped in bulk
+        self.swap_enabled = True
+        self.init_buffer(bytearray(buffer))
+
+    @property
+    def result(self):
+        return self.source
+
+    @classmethod
+    def _make_swapper(cls, fmt):
+        return (struct.Struct("<" + fmt), struct.Struct(">" + fmt))
+
+    def _swap(self, offset, size, count=1):
+        if not self.swap_enabled:
+            return
+        if count > 0x100:
+            np.frombuffer(self.source, dtype=f"u{size}", count=count, offset=offset).byteswap(inplace=True)
+            return
+        key = (size, count)
+        swapper = self._swappers.get(key)
+        if swapper is None:
+            swapper = self._make_swapper(f"{count}{self._UNSIGNED_TYPES[size]}")
+            self._swappers[key] = swapper
+        swapper[1].pack_into(self.source, offset, *swapper[0].unpack_from(self.source, offset))
+
+    def _swap_struct(self, offset, packer):
+        if not self.swap_enabled:
+            return
+        swapper = self._swappers.get(packer.format)
+        if swapper is None:
+            fmt = ""
+            for count, typecode in re.findall(r"(\d*)([a-zA-Z?])", packer.format):
+                if typecode in "sp":
+                    fmt += f"{count}s"
+                else:
+                    fmt += f"{count}{self._UNSIGNED_TYPES[struct.calcsize('<' + typecode)]}"
+            swapper = self._make_swapper(fmt)
+            self._swappers[packer.format] = swapper
+        swapper[1].pack_into(self.source, offset, *swapper[0].unpack_from(self.source, offset))
+
+    def _rw_single(self, typecode, size, value, endianness=None):
+        if size == 1:
+            return super()._rw_single(typecode, size, value, endianness)
+        offset = self.cursor
+        if self.swap_first:
+            self._swap(offset, size)
+            return super()._rw_single(typecode, size, value, endianness)
+        value = super()._rw_single(typecode, size, value, endianness)
+        self._swap(offset, size)
+        return value
+
+    def _rw_multiple(self, typecode, size, value, shape, endianness=None):
+        if size == 1:
+            return super()._rw_multiple(typecode, size, value, shape, endianness)
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        count = 1
+        for elem in shape:
+            count *= elem
+        offset = self.cursor
+        if self.swap_first:
+            self._swap(offset, size, count)
+            return super()._rw_multiple(typecode, size, value, shape, endianness)
+        value = super()._rw_multiple(typecode, size, value, shape, endianness)
+        self._swap(offset, size, count)
+        return value
+
+    def _rw_array(self, typecode, size, value, shape, endianness=None):
+        if size == 1:
+            return super()._rw_array(typecode, size, value, shape, endianness)
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        count = 1
+        for elem in shape:
+            count *= elem
+        offset = self.cursor
+        if self.swap_first:
+            self._swap(offset, size, count)
+            return super()._rw_array(typecode, size, value, shape, endianness)
+        value = super()._rw_array(typecode, size, value, shape, endianness)
+        self._swap(offset, size, count)
+        return value
+
+    def _swap_records(self, offset, dtype, count):
+        if self.swap_enabled:
+            np.frombuffer(self.source, dtype=dtype, count=count, offset=offset).byteswap(inplace=True)
+
+    def rw_records(self, value, dtype, count):
+        offset = self.cursor
+        if self.swap_first:
+            self._swap_records(offset, dtype, count)
+            return super().rw_records(value, dtype, count)
+        value = super().rw_records(value, dtype, count)
+        self._swap_records(offset, dtype, count)
+        return value
+
+    def rw_obj_array(self, value, obj_constructor, shape, *args, validator=None, **kwargs):
+        # Arrays of objects with a compilable fixed layout (e.g. animation
+        # keyframes) are swapped in one go rather than field by field
+        dtype = None
+        get_compiled = getattr(getattr(obj_constructor, "read_write", None), "get_compiled", None)
+        if get_compiled is not None and self.swap_enabled and not kwargs:
+            element = obj_constructor()
+            compiled = get_compiled(element, element.context.endianness, args)
+            if compiled is not None:
+                dtype = compiled.swap_dtype()
+        if dtype is None:
+            return super().rw_obj_array(value, obj_constructor, shape, *args, validator=validator, **kwargs)
+
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        count = 1
+        for elem in shape:
+            count *= elem
+        offset = self.cursor
+
+        if self.swap_first:
+            self._swap_records(offset, dtype, count)
+        self.swap_enabled = False
+        try:
+            value = super().rw_obj_array(value, obj_constructor, shape, *args, validator=validator, **kwargs)
+        finally:
+            self.swap_enabled = True
+        if not self.swap_first:
+            self._swap_records(offset, dtype, count)
+        return value
+
+    def rw_struct(self, packer, values):
+        offset = self.cursor
+        if self.swap_first:
+            self._swap_struct(offset, packer)
+            return super().rw_struct(packer, values)
+        values = super().rw_struct(packer, values)
+        self._swap_struct(offset, packer)
+        return values
+
+
+class BufferStream:
+    """
+    Minimal file-like object that writes into a preallocated buffer starting
+    at 'offset', so that a Writer can fill a bytearray in place. Positions
+    are relative to 'offset'. Writing past the end of the buffer raises.
+    """
+    __slots__ = ("buffer", "cursor")
+
+    def __init__(self, buffer, offset=0):
+        self.buffer = memoryview(buffer).cast('B')[offset:]
+        self.cursor = 0
+
+    def write(self, data):
+        start = self.cursor
+        end   = start + len(data)
+        if end > len(self.buffer):
+            raise ValueError(f"Attempted to write {end - len(self.buffer)} bytes past the end of a {len(self.buffer)}-byte buffer")
+        self.buffer[start:end] = data
+        self.cursor = end
+        return len(data)
+
+    def tell(self):
+        return self.cursor
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.cursor = offset
+        elif whence == 1:
+            self.cursor += offset
+        elif whence == 2:
+            self.cursor = len(self.buffer) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        return self.cursor
+
+    def close(self):
+        self.buffer.release()
+
+
 class Writer(BinaryTargetBase):
     open_flags = "wb"
 
@@ -430,10 +1071,29 @@ class Writer(BinaryTargetBase):
         self.rw_uint32(value - offset, endianness)
         return value
 
+    def defer_uint32(self, endianness=None):
+        """
+        Writes a placeholder uint32 and returns its offset, so that the real
+        value can be filled in with patch_uint32 once it is known.
+        """
+        offset = self.tell()
+        self.rw_uint32(0, endianness)
+        return offset
+
+    def patch_uint32(self, offset, value, endianness=None):
+        current_offset = self.tell()
+        self.seek(offset)
+        self.rw_uint32(value, endianness)
+        self.seek(current_offset)
+
     def _rw_single(self, typecode, size, value, endianness=None):
         if endianness is None:
             endianness = self.context.endianness
-        self.bytestream.write(struct.pack(endianness + typecode, value))
+        try:
+            packer = self.structs[endianness][typecode]
+        except KeyError:
+            packer = self.get_struct(endianness, typecode)
+        self.bytestream.write(packer.pack(value))
         return value
 
     def _rw_multiple(self, typecode, size, value, shape, endianness=None):
@@ -446,12 +1106,42 @@ class Writer(BinaryTargetBase):
         for elem in shape:
             n_to_read *= elem
 
+        if isinstance(value, np.ndarray):
+            return self._rw_array(typecode, size, value, shape, endianness)
+
         data = value  # Shouldn't need to deepcopy since flatten_list will copy
         for _ in range(len(shape) - 1):
             data = flatten_list(data)
-        self.bytestream.write(struct.pack(endianness + typecode * n_to_read, *data))
+        self.bytestream.write(self.get_struct(endianness, typecode, n_to_read).pack(*data))
+        return value
+
+    def _rw_array(self, typecode, size, value, shape, endianness=None):
+        if endianness is None:
+            endianness = self.context.endianness
+
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        n_to_write = 1
+        for elem in shape:
+            n_to_write *= elem
+
+        data = np.asarray(value, dtype=self.get_dtype(endianness, typecode))
+        if data.size != n_to_write:
+            raise ValueError(f"Expected an array of {n_to_write} elements, received {data.size}")
+        self.bytestream.write(data.tobytes())
         return value
 
+    def rw_records(self, value, dtype, count):
+        data = np.asarray(value, dtype=dtype)
+        if data.size != count:
+            raise ValueError(f"Expected an array of {count} elements, received {data.size}")
+        self.bytestream.write(data.tobytes())
+        return value
+
+    def rw_struct(self, packer, values):
+        self.bytestream.write(packer.pack(*values))
+        return values
+
     def rw_str(self, value, length, encoding='ascii'):
         self.bytestream.write(value.encode(encoding))
         return value
@@ -482,56 +1172,20 @@ class Writer(BinaryTargetBase):
         return self.rw_bytestring(value, len(value))
 
     def rw_s3Quat(self, value, endianness=None):
-        components = copy.deepcopy(value)
-        abs_components = [abs(c) for c in components]
-        abs_largest_component = max(abs_components)
-        largest_index = abs_components.index(abs_largest_component)
-        largest_component = components[largest_index]
-        largest_component_sign = largest_component // (abs(largest_component))
-        # Get rid of the largest component
-        # No need to store the sign of the largest component, because
-        # (X, Y, Z, W) = (-X, -Y, -Z, -W)
-        # So just multiply through by the sign of the removed component to create an equivalent quaternion
-        # In this way, the largest component is always +ve
-        del components[largest_index]
-        components = [largest_component_sign * c for c in components]
-
-        # No other component can be larger than 1/sqrt(2) due to normalisation
-        # So map the remaining components from the interval [-1/sqrt(2), 1/sqrt(2)] to [0, 32767] to gain ~1.4x precision
-        components = [int(round(c * (2**.5) * 16384)) + 16383 for c in components]
-
-        for i, elem in enumerate(components):
-            if elem < 0:
-                components[i] = 0
-            elif elem > 32767:
-                components[i] = 32767
-
-        # Now convert to big-endian uint15s
-        packed_rep = [0, 0, 0, 0, 0, 0]
-        packed_rep[0] = (components[0] >> 8) & 0x7F
-        packed_rep[1] = components[0] & 0xFF
-        packed_rep[2] = (components[1] >> 7) & 0xFF
-        packed_rep[3] = ((components[1] & 0xFF) << 1) | ((components[2] & 0xC0) >> 7)
-        packed_rep[4] = (components[2] >> 6) & 0xFF
-        packed_rep[5] = ((components[2] & 0x3F) << 2) | largest_index
-
-        self.rw_uint8s(packed_rep, 6)
-
+        self.rw_s3Quats([value], 1, endianness)
         return value
 
     def rw_s3Quats(self, value, shape, endianness=None):
         if not hasattr(shape, "__getitem__"):
             shape = (shape,)
-        n_to_read = 1
+        n_to_write = 1
         for elem in shape:
-            n_to_read *= elem
-
-        data = value  # Shouldn't need to deepcopy since flatten_list will copy
-        for _ in range(len(shape) - 1):
-            data = flatten_list(data)
-        for d in data:
-            self.rw_s3Quat(d)
+            n_to_write *= elem
 
+        packed = pack_s3Quats(value)
+        if len(packed) != n_to_write:
+            raise ValueError(f"Expected {n_to_write} quaternions, received {len(packed)}")
+        self.bytestream.write(packed.tobytes())
         return value
 
     def rw_uv(self, value, endianness=None):
@@ -548,10 +1202,14 @@ class Writer(BinaryTargetBase):
         data = value  # Shouldn't need to deepcopy since flatten_list will copy
         for _ in range(len(shape) - 1):
             data = flatten_list(data)
+        context = self.context
         for d in data:
             if validator is not None:
                 validator(d)
-            self.rw_obj(d, *args, **kwargs)
+            if d.context is context:
+                d.read_write(self, *args, **kwargs)
+            else:
+                self.rw_obj(d, *args, **kwargs)
 
         return value
     
@@ -582,6 +1240,10 @@ class OffsetTracker(BinaryTargetBase):
 
     __slots__ = ("virtual_offset", "pointers")
 
+    # Objects that can report their size analytically via size_of are
+    # skipped over rather than traversed
+    use_size_of = True
+
     def __init__(self):
         super().__init__(None)
         self.virtual_offset = 0
@@ -597,6 +1259,14 @@ class OffsetTracker(BinaryTargetBase):
     def log_offset(self):
         self.pointers.append(self.virtual_offset)
 
+    def rw_obj(self, obj, *args, **kwargs):
+        if self.use_size_of:
+            size = obj.size_of(*args, **kwargs)
+            if size is not None:
+                self.adv_offset(size)
+                return obj
+        return super().rw_obj(obj, *args, **kwargs)
+
     def adv_offset(self, adv):
         self.virtual_offset += adv
 
@@ -606,6 +1276,14 @@ class OffsetTracker(BinaryTargetBase):
     def rw_offset_uint32(self, value, offset, endianness=None):
         return self.rw_uint32(value, endianness)
 
+    def defer_uint32(self, endianness=None):
+        offset = self.tell()
+        self.adv_offset(4)
+        return offset
+
+    def patch_uint32(self, offset, value, endianness=None):
+        pass
+
     def _rw_single(self, typecode, size, value, endianness=None):
         self.adv_offset(size)
         return value
@@ -617,11 +1295,27 @@ class OffsetTracker(BinaryTargetBase):
         for elem in shape:
             n_to_read *= elem
 
-        for i in range(n_to_read):
-            self.adv_offset(size)
+        self.adv_offset(size * n_to_read)
+        return value
+
+    def _rw_array(self, typecode, size, value, shape, endianness=None):
+        if not hasattr(shape, "__getitem__"):
+            shape = (shape,)
+        n_to_read = 1
+        for elem in shape:
+            n_to_read *= elem
+
+        self.adv_offset(size * n_to_read)
+        return value
 
+    def rw_records(self, value, dtype, count):
+        self.adv_offset(dtype.itemsize * count)
         return value
 
+    def rw_struct(self, packer, values):
+        self.adv_offset(packer.size)
+        return values
+
     def rw_str(self, value, length, encoding='ascii'):
         length = len(value.encode(encoding))
         self.adv_offset(length)
@@ -711,9 +1405,7 @@ class OffsetTracker(BinaryTargetBase):
         for elem in shape:
             n_to_read *= elem
 
-        for _ in range(n_to_read):
-            self.rw_s3Quat(None)
-
+        self.adv_offset(6 * n_to_read)
         return value
     
     def rw_new_obj(self, value, obj_constructor, *args, **kwargs):
@@ -734,6 +1426,9 @@ class OffsetTracker(BinaryTargetBase):
 class PointerCalculator(OffsetTracker):
     open_flags = None
 
+    # Needs to visit every object to record where its pointers land
+    use_size_of = False
+
     def tie_to_offset(self, value):
         return self.tell()
 
@@ -745,10 +1440,20 @@ class PointerCalculator(OffsetTracker):
 
 
 class Comparator(Reader):
+    """
+    Reads a rebuilt file while checking every read against the bytes of a
+    reference file, so that a mismatch raises at the exact field that
+    differs. Checking every primitive read is slow, so use find_mismatch to
+    hash-compare the whole file first and pass the mismatching region in
+    to only check reads that overlap it.
+    """
+    CHUNK_SIZE = 0x100000
+
     class ComparisonStream:
-        def __init__(self, reference_data):
+        def __init__(self, reference_data, region=None):
             self.bytestream = None
             self.reference_data = reference_data
+            self.region = region
             
         def fopen(self, filepath):
             self.bytestream = open(filepath, 'rb')
@@ -757,17 +1462,24 @@ class Comparator(Reader):
             self.bytestream.close()
             self.bytestream = None
             
+        def in_region(self, pos, count):
+            if self.region is None:
+                return True
+            start, end = self.region
+            return pos < end and pos + count > start
+            
         def read(self, count=None):
+            pos = self.tell()
             if count is None:
                 data = self.bytestream.read()
-                if data != self.reference_data[self.tell():]:
+                if self.in_region(pos, len(data)) and data != self.reference_data[pos:]:
                     raise ValueError("Streams were not equal!")
             else:
-                pos = self.tell()
-                ref_data = self.reference_data[pos:pos + count]
                 data = self.bytestream.read(count)
-                if data != ref_data:
-                    raise ValueError(f"Streams were not equal: [{pos}/{hex(pos)}] Read: {data} Reference: {ref_data}")
+                if self.in_region(pos, count):
+                    ref_data = self.reference_data[pos:pos + count]
+                    if data != ref_data:
+                        raise ValueError(f"Streams were not equal: [{pos}/{hex(pos)}] Read: {data} Reference: {ref_data}")
             return data
         
         def seek(self, position, whence=0):
@@ -776,20 +1488,47 @@ class Comparator(Reader):
         def tell(self):
             return self.bytestream.tell()
     
-    def __init__(self, filename, reference_data):
+    def __init__(self, filename, reference_data, region=None):
         super().__init__(filename)
         self.reference_data = reference_data
+        self.region = region
         
     def init_stream(self, bytestream):
-        self.bytestream = self.ComparisonStream(self.reference_data)
+        self.bytestream = self.ComparisonStream(self.reference_data, self.region)
         self.bytestream.bytestream = bytestream
         
     def destruct_stream(self):
         self.bytestream.fclose()
         self.bytestream = None
     
+    @staticmethod
+    def chunk_digest(data, start, chunk_size):
+        return hashlib.blake2b(data[start:start + chunk_size], digest_size=16).digest()
+    
+    @classmethod
+    def find_mismatch(cls, data, reference_data, chunk_size=None):
+        """
+        Compares two buffers chunk-by-chunk by hash, and returns the
+        (start, end) byte range of the first chunk that differs, or None if
+        the buffers are identical. If one buffer is a prefix of the other,
+        the range covers the chunk where the shorter one ends.
+        """
+        if chunk_size is None:
+            chunk_size = cls.CHUNK_SIZE
+        data = memoryview(data).cast('B')
+        reference_data = memoryview(reference_data).cast('B')
+        
+        shared_size = min(len(data), len(reference_data))
+        for start in range(0, shared_size, chunk_size):
+            if cls.chunk_digest(data, start, chunk_size) != cls.chunk_digest(reference_data, start, chunk_size):
+                return (start, min(start + chunk_size, max(len(data), len(reference_data))))
+        if len(data) != len(reference_data):
+            start = (shared_size // chunk_size) * chunk_size
+            return (start, max(len(data), len(reference_data)))
+        return None
+    
     def __enter__(self):
-        self.bytestream = self.ComparisonStream(self.reference_data)
+        self.bytestream = self.ComparisonStream(self.reference_data, self.region)
         self.bytestream.fopen(self.filename)
         return self
     
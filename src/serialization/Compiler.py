@@ -0,0 +1,309 @@
+import array
+import copy
+import functools
+import math
+import struct
+
+import numpy as np
+
+from .BinaryTargets import BinaryTargetBase, Context
+
+
+class NotCompilableError(Exception):
+    pass
+
+
+class TraceValue:
+    """
+    Placeholder handed around while tracing a method. Any attempt to inspect
+    it means the method's layout depends on the data, so tracing is aborted.
+    """
+    __slots__ = ("attribute", "op")
+
+    def __init__(self, attribute=None, op=None):
+        self.attribute = attribute
+        self.op = op
+
+    def _abort(self, *args, **kwargs):
+        raise NotCompilableError("Layout depends on a serialised value")
+
+    __bool__ = __index__ = __int__ = __float__ = __len__ = __iter__ = _abort
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = _abort
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = _abort
+    __truediv__ = __floordiv__ = __and__ = __or__ = __getitem__ = _abort
+    __hash__ = object.__hash__
+
+
+class TracingTarget(BinaryTargetBase):
+    """
+    Records the primitive operations performed by a method instead of
+    reading or writing anything. Anything that isn't a scalar or a flat
+    fixed-count run of scalars makes the method uncompilable.
+    """
+    __slots__ = ("ops", "trace_mode")
+
+    def __init__(self, trace_mode, endianness):
+        super().__init__(None)
+        self.context = Context(endianness)
+        self.ops = []
+        self.trace_mode = trace_mode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback):
+        pass
+
+    def _record(self, typecode, value, count, endianness):
+        if not isinstance(value, TraceValue) or value.attribute is None:
+            raise NotCompilableError("Only attributes of the object can be compiled")
+        if endianness is None:
+            endianness = self.context.endianness
+        op = (value.attribute, typecode, count, endianness)
+        self.ops.append(op)
+        return TraceValue(None, op)
+
+    def _rw_single(self, typecode, size, value, endianness=None):
+        return self._record(typecode, value, None, endianness)
+
+    def _rw_multiple(self, typecode, size, value, shape, endianness=None):
+        if hasattr(shape, "__getitem__"):
+            if len(shape) != 1:
+                raise NotCompilableError("Only flat runs can be compiled")
+            shape = shape[0]
+        if type(shape) is not int:
+            raise NotCompilableError("Run lengths must be fixed")
+        return self._record(typecode, value, shape, endianness)
+
+    def _unsupported(self, *args, **kwargs):
+        raise NotCompilableError("Method performs an operation that cannot be compiled")
+
+    rw_obj = rw_obj_method = rw_obj_array = rw_new_obj = rw_obj_variant = _unsupported
+    _rw_array = rw_records = _handle_pads = rw_str = rw_cstr = rw_uint16_sized_str = _unsupported
+    rw_bytestring = rw_bytestrings = rw_unbounded_bytestring = _unsupported
+    rw_s3Quat = rw_s3Quats = rw_uv = align = align_with = align_to = _unsupported
+    tell = seek = global_tell = local_tell = defer_uint32 = patch_uint32 = _unsupported
+
+    def mode(self):
+        return self.trace_mode
+
+
+class CompiledRun:
+    """
+    A pair of generated functions that read or write a fixed-layout method
+    with one precompiled Struct per endianness run.
+    """
+    def __init__(self, ops, name):
+        self.ops = ops
+        self.attributes = [op[0] for op in ops]
+        self.source = None
+        self.read = None
+        self.write = None
+        self.structs = []
+        self._generate(name)
+
+    def swap_dtype(self):
+        """
+        A structured dtype with one unsigned integer field per serialised
+        value, for byte-swapping whole arrays of the object in place.
+        """
+        fields = []
+        for i, (_, typecode, count, _) in enumerate(self.ops):
+            size = struct.calcsize("<" + typecode)
+            fields.append((f"f{i}", f"<u{size}", () if count is None else (count,)))
+        return np.dtype(fields)
+
+    def _generate(self, name):
+        # Merge consecutive operations of the same endianness into runs
+        runs = []
+        for op in self.ops:
+            if runs and runs[-1][0] == op[3]:
+                runs[-1][1].append(op)
+            else:
+                runs.append((op[3], [op]))
+
+        namespace = {"array": array.array}
+        read_lines  = [f"def {name}_read(obj, rw):"]
+        write_lines = [f"def {name}_write(obj, rw):"]
+        for run_idx, (endianness, ops) in enumerate(runs):
+            fmt = endianness + "".join(tc if count is None else f"{count}{tc}" for _, tc, count, _ in ops)
+            packer = struct.Struct(fmt)
+            self.structs.append(packer)
+            namespace[f"s{run_idx}"] = packer
+
+            read_lines.append(f"    v = rw.rw_struct(s{run_idx}, None)")
+            packed_values = []
+            idx = 0
+            for attribute, typecode, count, _ in ops:
+                if count is None:
+                    read_lines.append(f"    obj.{attribute} = v[{idx}]")
+                    packed_values.append(f"obj.{attribute}")
+                    idx += 1
+                else:
+                    arr_typecode = 'f' if typecode == 'e' else typecode
+                    read_lines.append(f"    obj.{attribute} = array('{arr_typecode}', v[{idx}:{idx+count}])")
+                    write_lines.append(f"    if len(obj.{attribute}) != {count}:")
+                    write_lines.append(f"        raise ValueError(f\"Expected '{attribute}' to contain {count} elements, but it contains {{len(obj.{attribute})}}\")")
+                    packed_values.append(f"*obj.{attribute}")
+                    idx += count
+            write_lines.append(f"    rw.rw_struct(s{run_idx}, ({', '.join(packed_values)},))")
+
+        self.source = "\n".join(read_lines) + "\n\n" + "\n".join(write_lines) + "\n"
+        exec(compile(self.source, f"<compiled {name}>", "exec"), namespace)
+        self.read  = namespace[f"{name}_read"]
+        self.write = namespace[f"{name}_write"]
+
+
+def trace(method, obj, mode, endianness, args):
+    """
+    Runs 'method' against a copy of 'obj' whose attributes have been swapped
+    for TraceValues, and checks that every operation reads an attribute and
+    stores the result straight back into it.
+    """
+    traced = copy.copy(obj)
+    attributes = [k for k in vars(traced)]
+    for attribute in attributes:
+        setattr(traced, attribute, TraceValue(attribute))
+
+    rw = TracingTarget(mode, endianness)
+    method(traced, rw, *args)
+
+    state = vars(traced)
+    if list(state) != attributes:
+        raise NotCompilableError("Method creates new attributes")
+    written = set()
+    for attribute, value in state.items():
+        if type(value) is not TraceValue:
+            raise NotCompilableError(f"Attribute '{attribute}' is assigned a value that does not come from the stream")
+        if value.op is None:
+            if value.attribute != attribute:
+                raise NotCompilableError(f"Attribute '{attribute}' is reassigned")
+            continue
+        if value.op[0] != attribute:
+            raise NotCompilableError(f"Attribute '{attribute}' is assigned a value read for '{value.op[0]}'")
+        written.add(attribute)
+
+    if len(written) != len(rw.ops) or len(written) != len(set(op[0] for op in rw.ops)):
+        raise NotCompilableError("Every serialised value must be stored in exactly one attribute")
+    return rw.ops
+
+
+def compile_method(method, obj, endianness, args):
+    """
+    Traces 'method' in both read and write mode and returns a CompiledRun,
+    or None if the method doesn't have a fixed layout.
+    """
+    try:
+        ops = trace(method, obj, "read", endianness, args)
+        if not ops or ops != trace(method, obj, "write", endianness, args):
+            return None
+    except Exception:
+        # Any failure just means the generic path has to be used
+        return None
+    return CompiledRun(ops, f"{type(obj).__name__}_{method.__name__}")
+
+
+def fixed_layout(method):
+    """
+    Marks a read_write-style method as a candidate for compilation. When the
+    binary target was created with use_compiled=True, the method is traced
+    once per (class, mode, endianness, args) signature and replaced with a
+    generated function that unpacks or packs all of its fields with one
+    precompiled Struct. Methods that turn out not to have a fixed layout
+    keep using the generic path.
+    """
+    cache = {}
+
+    def get_compiled(obj, endianness, args):
+        key = (type(obj), endianness, args)
+        try:
+            return cache[key]
+        except KeyError:
+            compiled = compile_method(method, obj, endianness, args)
+            cache[key] = compiled
+            return compiled
+        except TypeError:
+            # Unhashable arguments
+            return None
+
+    @functools.wraps(method)
+    def wrapper(self, rw, *args, **kwargs):
+        if rw.use_compiled and not kwargs:
+            mode = rw.mode()
+            if mode == "read" or mode == "write":
+                compiled = get_compiled(self, rw.context.endianness, args)
+                if compiled is not None:
+                    if mode == "read":
+                        compiled.read(self, rw)
+                    else:
+                        compiled.write(self, rw)
+                    return
+        method(self, rw, *args, **kwargs)
+
+    wrapper.generic = method
+    wrapper.compiled = cache
+    wrapper.get_compiled = get_compiled
+    return wrapper
+
+
+def compare_compiled(obj, *args, **kwargs):
+    """
+    Serialises 'obj' with both the generic and compiled paths, reads the
+    result back both ways, and returns a list of every difference found.
+    An empty list means the compiled functions are indistinguishable from
+    the generic ones for this object.
+    """
+    differences = []
+    generic_bytes  = obj.pack(*args, **kwargs)
+    compiled_bytes = obj.pack(*args, use_compiled=True, **kwargs)
+    if generic_bytes != compiled_bytes:
+        mismatch = next((i for i, (a, b) in enumerate(zip(generic_bytes, compiled_bytes)) if a != b),
+                        min(len(generic_bytes), len(compiled_bytes)))
+        differences.append(f"Written bytes differ from offset {mismatch}")
+
+    generic  = copy.deepcopy(obj)
+    compiled = copy.deepcopy(obj)
+    generic.unpack(generic_bytes, *args, **kwargs)
+    compiled.unpack(generic_bytes, *args, use_compiled=True, **kwargs)
+    _diff(generic, compiled, type(obj).__name__, differences)
+    return differences
+
+
+def _state(obj):
+    state = dict(getattr(obj, "__dict__", {}))
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for slot in ([slots] if isinstance(slots, str) else slots):
+            if slot != "__dict__" and hasattr(obj, slot):
+                state[slot] = getattr(obj, slot)
+    return state
+
+
+def _diff(a, b, path, differences):
+    if a is b:
+        pass
+    elif type(a) is not type(b):
+        differences.append(f"{path}: type {type(a).__name__} != {type(b).__name__}")
+    elif isinstance(a, np.ndarray):
+        if a.dtype != b.dtype or a.shape != b.shape or not np.array_equal(a, b, equal_nan=a.dtype.kind in "fc"):
+            differences.append(f"{path}: arrays differ")
+    elif isinstance(a, (list, tuple, array.array)):
+        if len(a) != len(b):
+            differences.append(f"{path}: length {len(a)} != {len(b)}")
+        else:
+            for i, (sub_a, sub_b) in enumerate(zip(a, b)):
+                _diff(sub_a, sub_b, f"{path}[{i}]", differences)
+    elif isinstance(a, float):
+        if a != b and not (math.isnan(a) and math.isnan(b)):
+            differences.append(f"{path}: {a!r} != {b!r}")
+    elif isinstance(a, (int, str, bytes, bytearray, memoryview, type)):
+        if a != b:
+            differences.append(f"{path}: {a!r} != {b!r}")
+    else:
+        state_a = _state(a)
+        state_b = _state(b)
+        if state_a.keys() != state_b.keys():
+            differences.append(f"{path}: attributes differ")
+            return
+        for attribute, value in state_a.items():
+            _diff(value, state_b[attribute], f"{path}.{attribute}", differences)
@@ -0,0 +1,183 @@
+import time
+
+
+_profiled_classes = {}
+
+
+def _make_profiled_class(cls):
+    """
+    Builds a subclass of a binary target whose rw_obj and rw_obj_array
+    report to the target's profiler. Targets are switched to this class
+    only while a profiler is attached, so unprofiled runs execute exactly
+    the same code as before.
+    """
+    class ProfiledTarget(cls):
+        __slots__ = ()
+        unprofiled_class = cls
+
+        def rw_obj(self, obj, *args, **kwargs):
+            profiler = self.profiler
+            start = profiler.push(self, type(obj).__name__)
+            try:
+                return super().rw_obj(obj, *args, **kwargs)
+            finally:
+                profiler.pop(self, start, 1)
+
+        def rw_obj_array(self, value, obj_constructor, shape, *args, validator=None, **kwargs):
+            if not hasattr(shape, "__getitem__"):
+                shape = (shape,)
+            count = 1
+            for elem in shape:
+                count *= elem
+
+            # The array is recorded as a single frame named after its
+            # element type, with one call per element. When reading, the
+            # type isn't known until the first element has been created.
+            profiler = self.profiler
+            first = value
+            while isinstance(first, (list, tuple)) and len(first):
+                first = first[0]
+            if first is None or isinstance(first, (list, tuple)):
+                def constructor():
+                    obj = obj_constructor()
+                    profiler.rename(type(obj).__name__)
+                    return obj
+                start = profiler.push(self, "?")
+            else:
+                constructor = obj_constructor
+                start = profiler.push(self, type(first).__name__)
+
+            try:
+                return super().rw_obj_array(value, constructor, shape, *args, validator=validator, **kwargs)
+            finally:
+                profiler.pop(self, start, count)
+
+    ProfiledTarget.__name__ = f"Profiled{cls.__name__}"
+    ProfiledTarget.__qualname__ = ProfiledTarget.__name__
+    return ProfiledTarget
+
+
+class Profiler:
+    """
+    Records wall time, call count and bytes consumed for every rw_obj and
+    rw_obj_array call made by the binary targets it is attached to, keyed
+    by the nesting path of Serializable types. A single Profiler can be
+    attached to several targets in turn to accumulate results over many
+    files.
+
+    Usage:
+        profiler = Profiler()
+        binary.read(filepath, profiler=profiler)
+        print(profiler.format_table())
+        profiler.write_collapsed("out.folded")
+    """
+    def __init__(self):
+        # {(mode, Type, Type, ...): [calls, inclusive seconds, bytes]}
+        self.records = {}
+        self._stack = []
+
+    def attach(self, rw):
+        cls = getattr(type(rw), "unprofiled_class", type(rw))
+        profiled_cls = _profiled_classes.get(cls)
+        if profiled_cls is None:
+            profiled_cls = _make_profiled_class(cls)
+            _profiled_classes[cls] = profiled_cls
+        rw.profiler = self
+        rw.__class__ = profiled_cls
+        return rw
+
+    def detach(self, rw):
+        rw.__class__ = getattr(type(rw), "unprofiled_class", type(rw))
+        rw.profiler = None
+        return rw
+
+    def reset(self):
+        self.records = {}
+        self._stack = []
+
+    ##################
+    # Record Keeping #
+    ##################
+
+    def push(self, rw, name):
+        self._stack.append(name)
+        return (rw.tell(), time.perf_counter())
+
+    def rename(self, name):
+        self._stack[-1] = name
+
+    def pop(self, rw, start, calls):
+        elapsed = time.perf_counter() - start[1]
+        n_bytes = rw.tell() - start[0]
+        path = (rw.mode(), *self._stack)
+        self._stack.pop()
+        if calls == 0:
+            return
+        record = self.records.get(path)
+        if record is None:
+            self.records[path] = [calls, elapsed, n_bytes]
+        else:
+            record[0] += calls
+            record[1] += elapsed
+            record[2] += n_bytes
+
+    #############
+    # Reporting #
+    #############
+
+    def self_times(self):
+        """
+        Returns {path: seconds spent in that frame excluding its children}.
+        """
+        self_times = {path: record[1] for path, record in self.records.items()}
+        for path, record in self.records.items():
+            parent = path[:-1]
+            if parent in self_times:
+                self_times[parent] -= record[1]
+        return self_times
+
+    def by_type(self):
+        """
+        Aggregates the records into one row per type, as a list of
+        (name, calls, total seconds, self seconds, bytes) sorted by self
+        time. Frames nested inside another frame of the same type are not
+        added to its total time or byte count again.
+        """
+        rows = {}
+        for path, self_time in self.self_times().items():
+            calls, elapsed, n_bytes = self.records[path]
+            name = path[-1]
+            row = rows.get(name)
+            if row is None:
+                row = rows[name] = [name, 0, 0., 0., 0]
+            row[1] += calls
+            row[3] += self_time
+            if name not in path[1:-1]:
+                row[2] += elapsed
+                row[4] += n_bytes
+        return sorted((tuple(row) for row in rows.values()), key=lambda row: row[3], reverse=True)
+
+    def format_table(self, limit=None):
+        rows = self.by_type()
+        if limit is not None:
+            rows = rows[:limit]
+        width = max([len("Type")] + [len(row[0]) for row in rows])
+        lines = [f"{'Type'.ljust(width)}  {'Calls':>10}  {'Total (s)':>10}  {'Self (s)':>10}  {'Bytes':>12}"]
+        for name, calls, total, self_time, n_bytes in rows:
+            lines.append(f"{name.ljust(width)}  {calls:>10}  {total:>10.4f}  {self_time:>10.4f}  {n_bytes:>12}")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self):
+        """
+        Returns the self time of every nesting path in microseconds, in the
+        'collapsed stack' format read by flamegraph.pl and speedscope.
+        """
+        lines = []
+        for path, self_time in sorted(self.self_times().items()):
+            lines.append(f"{';'.join(path)} {max(round(self_time * 1e6), 0)}")
+        return lines
+
+    def write_collapsed(self, filepath):
+        with open(filepath, 'w') as F:
+            for line in self.collapsed_stacks():
+                F.write(line + "\n")
@@ -1,7 +1,6 @@
-import copy
 import io
 
-from .BinaryTargets import Reader, Writer, PointerCalculator, Context
+from .BinaryTargets import Reader, MmapReader, Writer, OffsetTracker, PointerCalculator, Context, BufferStream, Transcoder
 
 
 class Serializable:
@@ -15,33 +14,109 @@ class Serializable:
     __slots__ = ("context",)
 
     def __init__(self, context=None):
+        # Contexts are immutable and interned, so they are shared rather than
+        # copied; subclasses change theirs with context.with_endianness
         if context is None:
             self.context = Context()
         else:
-            self.context = copy.deepcopy(context)
+            self.context = context
 
-    def read(self, filepath, *args, **kwargs):
-        with Reader(filepath) as rw:
+    def read(self, filepath, *args, use_mmap=False, use_compiled=False, zero_copy=False, profiler=None, **kwargs):
+        reader = MmapReader if use_mmap else Reader
+        with reader(filepath) as rw:
+            rw.use_compiled = use_compiled
+            rw.zero_copy    = zero_copy
+            if profiler is not None:
+                profiler.attach(rw)
             rw.rw_obj(self, *args, **kwargs)
 
 
-    def unpack(self, bytestring, *args, **kwargs):
-        rw = Reader(None)
-        rw.bytestream = io.BytesIO()
-        rw.bytestream.write(bytestring)
-        rw.seek(0)
-        rw.rw_obj(self, *args, **kwargs)
+    def unpack(self, bytestring, *args, use_mmap=False, use_compiled=False, zero_copy=False, profiler=None, **kwargs):
+        if use_mmap:
+            rw = MmapReader(None)
+            rw.use_compiled = use_compiled
+            rw.zero_copy    = zero_copy
+            if profiler is not None:
+                profiler.attach(rw)
+            rw.init_buffer(bytestring)
+            try:
+                rw.rw_obj(self, *args, **kwargs)
+            finally:
+                rw.destruct_buffer()
+        else:
+            rw = Reader(None)
+            rw.use_compiled = use_compiled
+            if profiler is not None:
+                profiler.attach(rw)
+            rw.bytestream = io.BytesIO()
+            rw.bytestream.write(bytestring)
+            rw.seek(0)
+            rw.rw_obj(self, *args, **kwargs)
 
-    def write(self, filepath, *args, **kwargs):
+    def write(self, filepath, *args, use_compiled=False, profiler=None, **kwargs):
         with Writer(filepath) as rw:
+            rw.use_compiled = use_compiled
+            if profiler is not None:
+                profiler.attach(rw)
             rw.rw_obj(self, *args, **kwargs)
 
-    def pack(self, *args, **kwargs):
+    def pack(self, *args, use_compiled=False, profiler=None, **kwargs):
+        """
+        Serialises the object into a single bytearray of exactly the size
+        given by calc_size, without any intermediate copies.
+        """
+        buffer = bytearray(self.calc_size(*args, **kwargs))
+        size = self.pack_into(buffer, 0, *args, use_compiled=use_compiled, profiler=profiler, **kwargs)
+        if size != len(buffer):
+            raise ValueError(f"Calculated size of {type(self).__name__} is {len(buffer)}, but {size} bytes were written")
+        return buffer
+
+    def pack_into(self, buffer, offset, *args, use_compiled=False, profiler=None, **kwargs):
+        """
+        Serialises the object into a writable buffer (e.g. a bytearray or
+        mmap) starting at 'offset', and returns the number of bytes written.
+        The buffer must already be large enough to hold the object.
+        """
         rw = Writer(None)
-        rw.bytestream = io.BytesIO()
-        rw.rw_obj(self, *args, **kwargs)
-        rw.bytestream.seek(0)
-        return rw.bytestream.read()
+        rw.use_compiled = use_compiled
+        if profiler is not None:
+            profiler.attach(rw)
+        rw.bytestream = BufferStream(buffer, offset)
+        try:
+            rw.rw_obj(self, *args, **kwargs)
+            return rw.tell()
+        finally:
+            rw.bytestream.close()
+
+    def transcode(self, bytestring, *args, swapped_source=False, use_compiled=True, **kwargs):
+        """
+        Reads the object from 'bytestring' and returns a bytearray of the
+        same data with every typed value byte-swapped, i.e. converted
+        between big- and little-endian. See BinaryTargets.Transcoder.
+        """
+        rw = Transcoder(bytestring, swapped_source)
+        rw.use_compiled = use_compiled
+        try:
+            rw.rw_obj(self, *args, **kwargs)
+            return rw.result
+        finally:
+            rw.destruct_buffer()
+
+    def size_of(self, *args, **kwargs):
+        """
+        Override to return the serialised size of the object in bytes without
+        walking read_write. Returning None means the size is not known
+        analytically, and an OffsetTracker pass is used instead.
+        """
+        return None
+
+    def calc_size(self, *args, **kwargs):
+        size = self.size_of(*args, **kwargs)
+        if size is None:
+            with OffsetTracker() as rw:
+                rw.rw_obj(self, *args, **kwargs)
+                size = rw.tell()
+        return size
 
     def calc_pointers(self):
         with PointerCalculator() as rw:
@@ -0,0 +1,141 @@
+import contextlib
+import copy
+import os
+import time
+import tracemalloc
+
+from ..src.FileFormats.GFS import GFSBinary
+from ..src.FileFormats.GFS.SubComponents.CommonStructures.SceneNode.Mesh.Interface import MeshInterface
+from ..src.FileFormats.GFS.SubComponents.CommonStructures.SceneNode.Mesh.MeshBinary import MeshBinary, VertexBinary
+from ..src.serialization.Serializable import Serializable
+
+if 'bpy' in globals():
+    raise Exception("'bpy' module has been loaded - this benchmark is incompatible with the bpy module")
+
+
+MESH_VERSION = 0x01105100
+
+
+#####################
+# Baseline Contexts #
+#####################
+
+class BaselineContext:
+    """
+    The Context as it was before it was interned: a mutable object that
+    every Serializable allocated for itself, or deep-copied from the one it
+    was given, and whose endianness constructors then set in place.
+    """
+    __slots__ = ("endianness",)
+
+    def __init__(self, endianness="<"):
+        self.endianness = endianness
+
+    def with_endianness(self, endianness):
+        self.endianness = endianness
+        return self
+
+
+def baseline_serializable_init(self, context=None):
+    if context is None:
+        self.context = BaselineContext()
+    else:
+        self.context = copy.deepcopy(context)
+
+
+@contextlib.contextmanager
+def baseline_contexts():
+    """
+    Gives every Serializable constructed inside the block its own private
+    Context, so that rw_obj has to swap contexts on every object as it did
+    before contexts were shared.
+    """
+    interned_init = Serializable.__init__
+    Serializable.__init__ = baseline_serializable_init
+    try:
+        yield
+    finally:
+        Serializable.__init__ = interned_init
+
+
+################
+# Test Inputs #
+################
+
+def make_mesh_bytes(n_vertices):
+    """
+    Packs a generated skinned mesh, which decodes through the same vertex
+    codec and VertexBuffer as meshes read from GFS files.
+    """
+    vertices = []
+    for i in range(n_vertices):
+        v = VertexBinary()
+        v.position  = [i, i, i]
+        v.normal    = [0., 1., 0.]
+        v.texcoord0 = [0.5, 0.5]
+        v.weights   = [1., 0., 0., 0.]
+        v.indices   = [0, 0, 0, 0]
+        vertices.append(v)
+
+    mesh = MeshInterface()
+    mesh.node          = 0
+    mesh.vertices      = vertices
+    mesh.indices       = [i % n_vertices for i in range(3*(n_vertices // 3))]
+    mesh.index_type    = 2 if n_vertices >= 2**16 else 1
+    mesh.material_name = "material"
+    mesh.unknown_0x12  = 0
+    return mesh.to_binary().pack(MESH_VERSION)
+
+
+###############
+# Measurement #
+###############
+
+def measure(binary_type, data, args, repeats):
+    tracemalloc.start()
+    binary = binary_type()
+    binary.unpack(data, *args)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best_read = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        binary = binary_type()
+        binary.unpack(data, *args)
+        best_read = min(best_read, time.perf_counter() - start)
+
+    best_write = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = binary.pack(*args)
+        best_write = min(best_write, time.perf_counter() - start)
+
+    return allocated, best_read, best_write, out
+
+
+def execute(n_vertices=100000, filepath=None, repeats=5):
+    """
+    Reads and writes a generated mesh, and optionally a GFS file, with the
+    interned Context singletons and with one private Context per object as
+    before they were shared, checking that both produce the same bytes.
+    """
+    cases = [(f"{n_vertices}-vertex MeshBinary", MeshBinary, make_mesh_bytes(n_vertices), (MESH_VERSION,))]
+    if filepath is not None:
+        with open(filepath, 'rb') as F:
+            cases.append((os.path.basename(filepath), GFSBinary, F.read(), ()))
+
+    results = {}
+    for name, binary_type, data, args in cases:
+        with baseline_contexts():
+            baseline = measure(binary_type, data, args, repeats)
+        interned = measure(binary_type, data, args, repeats)
+        assert baseline[3] == interned[3] == data, f"{name} was not rebuilt exactly"
+        results[name] = {"per-object contexts": baseline[:3], "interned contexts": interned[:3]}
+
+        print(f"{name}, best of {repeats}")
+        for label, (allocated, read_time, write_time) in results[name].items():
+            print(f"- {label.ljust(20)}: {allocated/1024/1024:7.2f} MiB allocated, read {read_time:.3f}s, write {write_time:.3f}s")
+        (old_alloc, old_read, old_write), (new_alloc, new_read, new_write) = results[name].values()
+        print(f"Saved {(old_alloc - new_alloc)/1024/1024:.2f} MiB, {100*(1 - new_read/old_read):.1f}% of the read time and {100*(1 - new_write/old_write):.1f}% of the write time.")
+    return results
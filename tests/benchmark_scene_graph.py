@@ -0,0 +1,165 @@
+import sys
+import time
+
+from ..src.FileFormats.GFS.SubComponents.CommonStructures.SceneNode.Interface import NodeInterface
+from ..src.FileFormats.GFS.SubComponents.CommonStructures.SceneNode.NodeBinary import FlatNodesWalker
+
+if 'bpy' in globals():
+    raise Exception("'bpy' module has been loaded - this benchmark is incompatible with the bpy module")
+
+
+#####################################
+# Recursive reference implementations
+#####################################
+# The scene-graph traversals as they were before they were made iterative,
+# kept here to check the results against and to time the old behaviour.
+
+def recursive_push_node_into_tree(node_idx, node_children, node_collection, id_map):
+    child_node_idxs = node_children.get(node_idx, [])
+    for cn_id in child_node_idxs:
+        id_map[cn_id] = len(id_map)
+        node_collection[node_idx].children.insert(0, node_collection[cn_id])
+        recursive_push_node_into_tree(cn_id, node_children, node_collection, id_map)
+
+
+def recursive_walk_nodes(node, operator):
+    operator.begin(node)
+    for child in node.children[::-1]:
+        recursive_walk_nodes(child, operator)
+    operator.end()
+
+
+def recursive_fetch_node_from_tree(node, parent, node_list):
+    node_idx = len(node_list)
+    node_list.append(NodeInterface.from_binary(node, parent))
+    for child in node.children[::-1]:
+        recursive_fetch_node_from_tree(child, node_idx, node_list)
+
+
+#######################
+# Synthetic skeletons #
+#######################
+
+def make_skeleton(n_nodes, depth):
+    """
+    A chain of 'depth' nodes hanging off the root, with the remaining nodes
+    attached directly to the root so that it is also very wide.
+    """
+    nodes = []
+    for i in range(n_nodes):
+        node = NodeInterface()
+        if i == 0:
+            node.parent_idx = -1
+        elif i <= depth:
+            node.parent_idx = i - 1
+        else:
+            node.parent_idx = 0
+        node.name = f"node_{i}"
+        node.position = [0., 0., 0.]
+        node.rotation = [0., 0., 0., 1.]
+        node.scale = [1., 1., 1.]
+        node.unknown_float = 1.
+        nodes.append(node)
+    return nodes
+
+
+def child_lists(node_list):
+    node_children = {}
+    for i, node in enumerate(node_list[1:]):
+        node_children.setdefault(node.parent_idx, []).append(i+1)
+    return node_children
+
+
+def build_tree(node_list, push):
+    node_collection = [node.to_binary() for node in node_list]
+    id_map = {0: 0}
+    start = time.perf_counter()
+    push(0, child_lists(node_list), node_collection, id_map)
+    return time.perf_counter() - start, (node_collection[0], id_map)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def best_of(repeats, func, *args):
+    results = [func(*args) for _ in range(repeats)]
+    return min(elapsed for elapsed, _ in results), results[-1][1]
+
+
+def iterative_walk(root):
+    return root.flattened()
+
+
+def recursive_walk(root):
+    walker = FlatNodesWalker()
+    recursive_walk_nodes(root, walker)
+    return walker.flat_nodes
+
+
+def iterative_unpack(root):
+    return NodeInterface.binary_node_tree_to_list(root)[0]
+
+
+def recursive_unpack(root):
+    node_list = []
+    recursive_fetch_node_from_tree(root, -1, node_list)
+    return node_list
+
+
+def measure(n_nodes, depth, repeats):
+    node_list = make_skeleton(n_nodes, depth)
+
+    try:
+        build_tree(node_list, recursive_push_node_into_tree)
+        fits_default_limit = True
+    except RecursionError:
+        fits_default_limit = False
+
+    new_build, (root, id_map) = best_of(repeats, build_tree, node_list, NodeInterface._push_node_into_tree)
+    new_walk,  flat_nodes     = best_of(repeats, timed, iterative_walk, root)
+    new_unpack, unpacked      = best_of(repeats, timed, iterative_unpack, root)
+
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, 2*depth + 1000))
+    try:
+        old_build, (old_root, old_id_map) = best_of(repeats, build_tree, node_list, recursive_push_node_into_tree)
+        old_walk,  old_flat_nodes         = best_of(repeats, timed, recursive_walk, old_root)
+        old_unpack, old_unpacked          = best_of(repeats, timed, recursive_unpack, old_root)
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+    assert id_map == old_id_map
+    assert flat_nodes.node_parents == old_flat_nodes.node_parents
+    assert [n.name.string for n in flat_nodes.nodes] == [n.name.string for n in old_flat_nodes.nodes]
+    assert [(n.name, n.parent_idx) for n in unpacked] == [(n.name, n.parent_idx) for n in old_unpacked]
+
+    return fits_default_limit, {"build tree":   (new_build,  old_build),
+                                "walk nodes":   (new_walk,   old_walk),
+                                "tree to list": (new_unpack, old_unpack)}
+
+
+########
+# Main #
+########
+
+def execute(shapes=((10000, 5000), (10000, 50), (50000, 50)), repeats=5):
+    """
+    Times assembling, walking and unpacking synthetic scene graphs with the
+    iterative traversals against the old recursive ones, checking that both
+    produce the same trees. Each skeleton is a chain of 'depth' nodes plus a
+    fan of nodes under the root; the recursive versions only survive the
+    deep chains with the recursion limit raised.
+    """
+    results = {}
+    for n_nodes, depth in shapes:
+        fits_default_limit, timings = measure(n_nodes, depth, repeats)
+        results[(n_nodes, depth)] = timings
+
+        limit_msg = "" if fits_default_limit else f" (recursive versions exceed the default recursion limit of {sys.getrecursionlimit()})"
+        print(f"{n_nodes} nodes, depth {depth}, best of {repeats}{limit_msg}")
+        for label, (new_time, old_time) in timings.items():
+            print(f"- {label.ljust(12)}: iterative {new_time:.4f}s, recursive {old_time:.4f}s")
+    return results
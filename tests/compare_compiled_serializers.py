@@ -0,0 +1,58 @@
+import os
+import time
+
+from ..src.FileFormats.GFS import GFSBinary
+from ..src.serialization.Compiler import compare_compiled
+
+if 'bpy' in globals():
+    raise Exception("'bpy' module has been loaded - this test is incompatible with the bpy module")
+
+
+def timed_read(filepath, use_compiled):
+    start = time.perf_counter()
+    binary = GFSBinary()
+    binary.read(filepath, use_mmap=True, use_compiled=use_compiled)
+    return binary, time.perf_counter() - start
+
+
+def execute(data_root, error_out, namefilter=None):
+    """
+    Reads every GFS file under data_root with the generic and compiled
+    serialisers, and checks that both produce identical objects and bytes.
+    """
+    model_files = []
+    for root, dirs, files in os.walk(data_root):
+        for file in files:
+            if any(file.endswith(ext) for ext in [".GMD", ".GFS"]):
+                model_files.append(os.path.join(root, file))
+    if namefilter is not None:
+        model_files = [f for f in model_files if namefilter(f)]
+    model_files = sorted(model_files)
+
+    generic_time  = 0.
+    compiled_time = 0.
+    failures = []
+    for i, filepath in enumerate(model_files):
+        print(f"Comparing {i+1}/{len(model_files)}: {filepath}", end="\r")
+        try:
+            binary, elapsed = timed_read(filepath, False)
+            generic_time += elapsed
+            _, elapsed = timed_read(filepath, True)
+            compiled_time += elapsed
+
+            differences = compare_compiled(binary)
+        except Exception as e:
+            differences = [f"{type(e).__name__}: {e}"]
+        if len(differences):
+            failures.append((filepath, differences))
+    print()
+
+    with open(error_out, 'w') as F:
+        for filepath, differences in failures:
+            F.write(f"{filepath}\n")
+            for difference in differences:
+                F.write(f"    {difference}\n")
+
+    print(f"{len(model_files) - len(failures)}/{len(model_files)} files identical")
+    print(f"Generic read: {generic_time:.3f}s, compiled read: {compiled_time:.3f}s")
+    return failures
@@ -35,7 +35,11 @@ def is_close(a, b, rtol=1e-5, atol=1e-4):
     else:
         return abs(a-b) > (atol + rtol*abs(b))
 
-def execute(data_root, error_out, start=0, stop=None, namefilter=None):
+def execute(data_root, error_out, start=0, stop=None, namefilter=None, profiler=None):
+    """
+    Pass a serialization.Profiler.Profiler as 'profiler' to accumulate
+    per-type read and write timings over every file in the run.
+    """
     #######################
     # VALIDATE ALL MODELS #
     #######################
@@ -99,7 +103,7 @@ def execute(data_root, error_out, start=0, stop=None, namefilter=None):
 
         gb = GFSBinary()
         try:
-            gb.read(file)
+            gb.read(file, profiler=profiler)
             
             if not all(ctr.version == gb.containers[0].version for ctr in gb.containers):
                 raise InconsistentVersionsError
@@ -172,25 +176,24 @@ def execute(data_root, error_out, start=0, stop=None, namefilter=None):
             # ##########
             # # EXPORT #
             # ##########
-            gb2.write("tmp.GMD")
+            gb2.write("tmp.GMD", profiler=profiler)
             
             with open(file, 'rb') as F, open("tmp.GMD", 'rb') as G:
                 fdata = F.read()
                 gdata = G.read()
-                    
-                try:
-                    for i, (b1, b2) in enumerate(zip(fdata, gdata)):
-                        assert b1 == b2, f"{i}: {b1} {b2}"
-                        
-                    assert len(fdata) == len(gdata)
-                except:
-                    cmp = Comparator(None, fdata)
+                
+                # Only re-read the rebuilt file field-by-field if the hashes
+                # show a difference, and only check the differing region
+                region = Comparator.find_mismatch(gdata, fdata)
+                if region is not None:
+                    cmp = Comparator(None, fdata, region)
                     stream = io.BytesIO()
                     stream.write(gdata)
                     stream.seek(0)
                     cmp.init_stream(stream)
                     gb3 = GFSBinary()
                     cmp.rw_obj(gb3)
+                    raise ValueError(f"Rebuilt file differs from the original between bytes {region[0]} and {region[1]}")
                     
                 assert len(fdata) == len(gdata)
                   
@@ -246,5 +249,9 @@ def execute(data_root, error_out, start=0, stop=None, namefilter=None):
             print(f"The first {max_print} of these are:")
         for filepath, err in unspecified_errors[:max_print]:
             print(filepath + ":", err)
+    
+    if profiler is not None:
+        print()
+        print(profiler.format_table(limit=20))
         
     return unspecified_error_count > 0
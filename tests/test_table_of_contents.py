@@ -0,0 +1,64 @@
+import struct
+
+from ..src.FileFormats.GFS.TableOfContents import scan_bytes, scan_file, find_gfs_files
+
+if 'bpy' in globals():
+    raise Exception("'bpy' module has been loaded - this test is incompatible with the bpy module")
+
+
+VERSION = 0x01105100
+
+
+def make_container(ctr_type, payload):
+    return struct.pack(">IIII", VERSION, ctr_type, len(payload) + 0x10, 0) + payload
+
+
+def make_file(containers):
+    """
+    Builds a GFS file from (type, payload) pairs, between a start and an
+    end container.
+    """
+    data = b'GFS0' + struct.pack(">III", VERSION, 0x00000001, 0)
+    for ctr_type, payload in containers:
+        data += make_container(ctr_type, payload)
+    data += struct.pack(">IIII", VERSION, 0x00000000, 0, 0)
+    return data
+
+
+def check_unknown_containers():
+    """
+    The scanner works from the size fields alone, so containers it has no
+    parser for are listed rather than aborting the scan.
+    """
+    containers = [(0x000100FA, b'\xAB'*0x24),
+                  (0x000100F8, b'\x01\x02\x03\x04'),
+                  (0x12345678, b'')]
+    data = make_file(containers)
+    toc = scan_bytes(data)
+
+    assert toc.container_types == [0x00000001, 0x000100FA, 0x000100F8, 0x12345678, 0x00000000], toc.container_types
+    assert [ctr.type_name for ctr in toc] == ["Start", "Unknown", "Blob", "Unknown", "End"], [ctr.type_name for ctr in toc]
+    assert toc.version == VERSION
+
+    offset = 0x10
+    for (ctr_type, payload), entry in zip(containers, list(toc)[1:-1]):
+        assert entry.offset == offset, (hex(ctr_type), entry.offset, offset)
+        assert entry.payload_offset == offset + 0x10
+        assert entry.size == len(payload) + 0x10
+        offset += entry.size
+
+
+def execute(data_root=None):
+    """
+    Checks the scanner on generated files, then scans every GFS file under
+    'data_root' if one is given.
+    """
+    check_unknown_containers()
+    print("Scanned generated files with unknown containers")
+
+    if data_root is not None:
+        n_files = 0
+        for filepath in find_gfs_files([data_root]):
+            scan_file(filepath)
+            n_files += 1
+        print(f"Scanned {n_files} files in {data_root}")